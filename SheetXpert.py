@@ -5,20 +5,60 @@
 # See LICENSE file for more information.
 
 # Import necessary libraries
+import time  # For timeouts, health checks and startup timings
+_startup_t0 = time.perf_counter()  # Reference point of the startup timing report
 import subprocess  # For running shell commands
-import tkinter as tk  # For creating the GUI
-from tkinter import scrolledtext, messagebox, filedialog, ttk  # Various tkinter components
-from fpdf import FPDF  # For creating PDF files
+import os  # For interacting with the operating system
+import base64  # For encoding PowerShell scripts
+import json  # For parsing PowerShell output
+import queue  # For passing worker responses between threads
+import atexit  # For closing PowerShell workers on exit
+try:
+    import tkinter as tk  # For creating the GUI
+    from tkinter import scrolledtext, messagebox, filedialog, ttk  # Various tkinter components
+except ImportError:
+    tk = None  # Headless installs can still use the command line
 import threading  # For running tasks in separate threads
 from datetime import datetime  # For handling date and time
-import os  # For interacting with the operating system
 import sys  # For system-specific parameters and functions
-from PIL import Image, ImageTk  # For image processing
+import re  # For pinning the PDF creation date
+import socket  # For the host name on native backends
+import argparse  # For the command line interface
+import concurrent.futures  # For rendering sheets on a process pool
+import csv  # For CSV exports
+import itertools  # For streaming exports
+import contextlib  # For timing startup phases and pipeline stages
+import hashlib  # For identifying snapshots in the render cache
+from collections import OrderedDict  # For the LRU render cache
+from collections.abc import Mapping  # For immutable snapshots
+
+# fpdf (PDF creation) and PIL (splash image) are imported where they are used: together they
+# add a few hundred milliseconds to startup, before anything is on screen.
 
 # Global configuration
 NOMBRE_MARCA = "SheetXpert"  # Brand name
 ICONO_NOMBRE = f"{NOMBRE_MARCA}.ico"  # Icon file name
 IMAGEN_SPLASH = f"{NOMBRE_MARCA}.png"  # Splash image file name
+CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)  # Hide console windows on Windows
+USE_SESSION_POOL = os.name == "nt"  # Keep PowerShell workers alive between calls on Windows
+SESSION_POOL_SIZE = 4  # Number of persistent PowerShell workers
+SESSION_TIMEOUT = 60  # Seconds a worker may take to answer before it is restarted
+SESSION_HEALTH_INTERVAL = 30  # Idle seconds after which a worker is pinged before reuse
+PROBE_WORKERS = SESSION_POOL_SIZE  # Probes collected at the same time
+PROBE_TIMEOUT = 20  # Seconds a probe may take before it is reported as unavailable
+UNAVAILABLE = "Unavailable"  # Value of fields whose probe timed out or was cancelled
+FLEET_CONCURRENCY = 32  # Hosts collected at the same time by the fleet collector
+FLEET_TIMEOUT = 120  # Seconds one host may take, connection included, before the attempt is abandoned
+FLEET_RETRIES = 2  # Extra attempts for a host that failed or timed out
+FLEET_BACKOFF = 2.0  # Seconds before the first retry; doubles with each further retry
+FLEET_HOST_PATTERN = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_.:@-]{0,253}")  # Host names, IPs and user@host; never an option or shell syntax
+STARTUP_TIMES = []  # (phase, start, end) in seconds since the program started
+REPORT_STARTUP = bool(os.environ.get("SHEETXPERT_STARTUP_TIMES"))  # Print the startup timing report
+EXPORT_DISK_SLOTS = 4  # Disks with their own export columns; further disks go to "Other Disks"
+RENDER_CACHE_SIZE = 64  # Rendered sheets kept in memory (text and PDF count separately)
+REQUIRED_FIELDS = ("Computer Name",)  # Fields needed before the save dialog opens (they make up the file name)
+UI_REFRESH_MS = 50  # Interval at which collected fields are copied into the window
+CACHE_TTL = {"static": 7 * 24 * 3600, "stable": 300, "volatile": 0}  # Seconds a cached probe result stays valid, per class
 idioma_actual = "es"  # Current language set to Spanish
 traducciones = {  # Translations for UI elements in Spanish and English
     "es": {
@@ -30,7 +70,10 @@ traducciones = {  # Translations for UI elements in Spanish and English
         "exito_msj": "PDF guardado en:\n{}",
         "error_titulo": "Error",
         "error_msj": "No se pudo guardar el PDF.\n{}",
-        "nombre_archivo_prefijo": "Ficha"
+        "nombre_archivo_prefijo": "Ficha",
+        "cancelar": "✖ Cancelar",
+        "guardar_pdf": "💾 Guardar PDF",
+        "no_disponible": "No disponible"
     },
     "en": {
         "titulo": "System Technical Sheet",
@@ -41,18 +84,224 @@ traducciones = {  # Translations for UI elements in Spanish and English
         "exito_msj": "PDF saved at:\n{}",
         "error_titulo": "Error",
         "error_msj": "Could not save PDF.\n{}",
-        "nombre_archivo_prefijo": "Sheet"
+        "nombre_archivo_prefijo": "Sheet",
+        "cancelar": "✖ Cancel",
+        "guardar_pdf": "💾 Save PDF",
+        "no_disponible": "Unavailable"
     }
 }
 
+# Executes a PowerShell command in a new process and returns the output
+def run_powershell_once(cmd, timeout=None):
+    encoded = base64.b64encode(cmd.encode('utf-16-le')).decode('ascii')  # -EncodedCommand avoids cmd.exe quoting issues
+    result = subprocess.run(["powershell", "-NoProfile", "-NonInteractive", "-EncodedCommand", encoded],
+                            capture_output=True, text=True, encoding="utf-8", errors="replace",
+                            timeout=timeout, creationflags=CREATE_NO_WINDOW)  # Run without a console window
+    return result.stdout
+
 # Executes a PowerShell command and returns the output
-def run_powershell(cmd):
+def run_powershell(cmd, timeout=None):
     try:
-        result = subprocess.run(["powershell", "-Command", cmd], capture_output=True, text=True, shell=True)
-        return result.stdout.strip()  # Return the output of the command
+        if USE_SESSION_POOL:
+            return get_session_pool().run(cmd, timeout).strip()  # Reuse a warm worker
+        return run_powershell_once(cmd, timeout).strip()  # Return the output of the command
     except Exception as e:
         return f"Error: {e}"  # Return error message if command fails
 
+# Errors raised by persistent PowerShell workers
+class PowerShellError(Exception):
+    pass
+
+class SessionTimeout(PowerShellError):  # The worker did not answer in time and was killed
+    pass
+
+class SessionCrashed(PowerShellError):  # The worker exited or its pipe broke
+    pass
+
+# Raised by fleet transports when a remote host cannot be reached or its command fails
+class TransportError(Exception):
+    pass
+
+# Worker loop run inside PowerShell. Requests and responses are single lines: "<id> <verb> <base64 utf-8 payload>"
+PS_WORKER_SCRIPT = r"""
+$enc = New-Object System.Text.UTF8Encoding $false
+[Console]::OutputEncoding = $enc
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    $parts = $line -split ' ', 3
+    if ($parts[1] -eq 'ping') {
+        [Console]::Out.WriteLine("$($parts[0]) pong ")
+        [Console]::Out.Flush()
+        continue
+    }
+    try {
+        $script = $enc.GetString([Convert]::FromBase64String($parts[2]))
+        $out = & ([scriptblock]::Create($script)) | Out-String
+        $status = 'ok'
+    } catch {
+        $out = $_.Exception.Message
+        $status = 'error'
+    }
+    [Console]::OutputEncoding = $enc  # Probe scripts may switch to an encoding that writes a BOM
+    [Console]::Out.WriteLine("$($parts[0]) $status " + [Convert]::ToBase64String($enc.GetBytes([string]$out)))
+    [Console]::Out.Flush()
+}
+"""
+
+# Command line that starts a persistent PowerShell worker
+def powershell_worker_argv():
+    encoded = base64.b64encode(PS_WORKER_SCRIPT.encode('utf-16-le')).decode('ascii')
+    return ["powershell", "-NoProfile", "-NonInteractive", "-EncodedCommand", encoded]
+
+# Encodes one protocol line
+def encode_frame(request_id, verb, payload=""):
+    return f"{request_id} {verb} {base64.b64encode(payload.encode('utf-8')).decode('ascii')}\n"
+
+# Decodes one protocol line into (id, verb or status, payload); returns None for stray output
+def decode_frame(line):
+    parts = line.strip().lstrip("\ufeff").split(" ", 2)  # A console encoding change can emit a byte order mark
+    if len(parts) < 2 or not parts[0].isdigit():
+        return None
+    try:
+        payload = base64.b64decode(parts[2] if len(parts) == 3 else "", validate=True).decode('utf-8', 'replace').lstrip("\ufeff")
+    except ValueError:
+        return None
+    return int(parts[0]), parts[1], payload
+
+# A long-lived interpreter process that answers framed requests over stdin/stdout
+class PowerShellSession:
+    def __init__(self, argv=None):
+        self.argv = argv or powershell_worker_argv()  # Any interpreter speaking the same framing works
+        self.process = None
+        self.responses = None
+        self.next_id = 0
+        self.last_used = 0.0
+        self.lock = threading.Lock()  # One request at a time per worker
+
+    def start(self):
+        self.process = subprocess.Popen(self.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, text=True, encoding="utf-8",
+                                        errors="replace", bufsize=1, creationflags=CREATE_NO_WINDOW)
+        self.responses = queue.Queue()
+        threading.Thread(target=self._read_loop, args=(self.process, self.responses), daemon=True).start()
+
+    @staticmethod
+    def _read_loop(process, responses):
+        for line in process.stdout:  # Forward every frame; stray text is ignored
+            frame = decode_frame(line)
+            if frame:
+                responses.put(frame)
+        responses.put(None)  # End of stream: the worker exited
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        if self.process is not None:
+            try:
+                self.process.kill()
+                self.process.wait(timeout=5)
+            except Exception:
+                pass
+        self.process = None
+
+    def request(self, verb, payload="", timeout=None):
+        with self.lock:
+            if not self.alive():
+                self.start()  # Start lazily and restart after a crash or hang
+            self.next_id += 1
+            request_id = self.next_id
+            try:
+                self.process.stdin.write(encode_frame(request_id, verb, payload))
+                self.process.stdin.flush()
+            except (OSError, ValueError) as e:
+                self.stop()
+                raise SessionCrashed(f"PowerShell worker pipe closed: {e}")
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    frame = self.responses.get(timeout=remaining)
+                except queue.Empty:
+                    self.stop()  # Hung worker: kill it so the next request gets a fresh one
+                    raise SessionTimeout(f"PowerShell worker did not answer within {timeout} s")
+                if frame is None:
+                    self.stop()
+                    raise SessionCrashed("PowerShell worker exited")
+                if frame[0] == request_id:
+                    self.last_used = time.monotonic()
+                    return frame[1], frame[2]
+
+    def run(self, script, timeout=None):
+        status, output = self.request("run", script, timeout)
+        if status != "ok":
+            raise PowerShellError(output.strip())
+        return output
+
+    def ping(self, timeout=5):
+        try:
+            return self.request("ping", timeout=timeout)[0] == "pong"
+        except PowerShellError:
+            return False
+
+# A small pool of persistent workers shared by concurrent callers
+class PowerShellPool:
+    def __init__(self, size=SESSION_POOL_SIZE, argv=None, timeout=SESSION_TIMEOUT):
+        self.size = size
+        self.argv = argv
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()  # Most recently used worker first, it is the warmest
+        self.sessions = []
+        self.lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if len(self.sessions) < self.size:
+                session = PowerShellSession(self.argv)
+                self.sessions.append(session)
+                return session
+        return self.idle.get()  # Wait for a worker to be released
+
+    def run(self, script, timeout=None):
+        session = self._acquire()
+        try:
+            if session.alive() and time.monotonic() - session.last_used > SESSION_HEALTH_INTERVAL and not session.ping():
+                session.stop()  # Unresponsive idle worker: restart it before use
+            try:
+                return session.run(script, timeout or self.timeout)
+            except SessionCrashed:
+                return session.run(script, timeout or self.timeout)  # Retry once on a fresh worker
+        finally:
+            self.idle.put(session)
+
+    def warm(self):
+        session = self._acquire()
+        try:
+            session.ping(self.timeout)  # Starting the worker pays PowerShell's cold start now
+        finally:
+            self.idle.put(session)
+
+    def close(self):
+        for session in self.sessions:
+            session.stop()
+
+_session_pool = None
+_session_pool_lock = threading.Lock()
+
+# Returns the shared PowerShell worker pool, creating it on first use
+def get_session_pool():
+    global _session_pool
+    with _session_pool_lock:
+        if _session_pool is None:
+            _session_pool = PowerShellPool()
+            atexit.register(_session_pool.close)
+    return _session_pool
+
 # Formats WMI date to a readable format
 def format_date_wmi(wmi_date):
     try:
@@ -64,93 +313,850 @@ def format_date_wmi(wmi_date):
         pass
     return ""  # Return empty string if formatting fails
 
-# Collects various data about the PC using PowerShell commands
-def get_pc_data():
+# PowerShell probes: each one queries a CIM class (or tool) once and evaluates to a hashtable
+PS_PROBES = {
+    "hostname": "@{ Name = (hostname) }",
+    "ipv4": "@{ IPAddress = @(Get-NetIPAddress -AddressFamily IPv4 | Where-Object { $_.IPAddress -notlike '169.*' -and $_.IPAddress -ne '127.0.0.1' } | ForEach-Object { $_.IPAddress }) }",
+    "wlan": "@{ SSID = ((netsh wlan show interfaces) -match '^\\s*SSID\\s*:\\s*(.+)$' | ForEach-Object { ($_ -split ':', 2)[1].Trim() } | Select-Object -First 1) }",
+    "identity": "$os = Get-CimInstance Win32_OperatingSystem; @{ UUID = (Get-CimInstance Win32_ComputerSystemProduct).UUID; Name = $env:COMPUTERNAME; "
+                "LastBootUpTime = $os.LastBootUpTime.ToString('yyyyMMddHHmmss'); SMBIOSBIOSVersion = (Get-CimInstance Win32_BIOS).SMBIOSBIOSVersion }",
+    "os": "$os = Get-CimInstance Win32_OperatingSystem; @{ Caption = $os.Caption; Version = $os.Version; BuildNumber = $os.BuildNumber; "
+          "InstallDate = $os.InstallDate.ToString('yyyyMMddHHmmss'); LastBootUpTime = $os.LastBootUpTime.ToString('yyyyMMddHHmmss') }",
+    "memory": "@{ Capacity = (Get-CimInstance Win32_PhysicalMemory | Measure-Object -Property Capacity -Sum).Sum }",
+    "disks": "@{ Disks = @(Get-CimInstance Win32_LogicalDisk -Filter 'DriveType=3' | ForEach-Object { "
+             "@{ DeviceID = $_.DeviceID; SizeGB = [math]::Round($_.Size/1GB,2); FreeGB = [math]::Round($_.FreeSpace/1GB,2) } }) }",
+    "computer_system": "$cs = Get-CimInstance Win32_ComputerSystem; @{ Manufacturer = $cs.Manufacturer; Model = $cs.Model }",
+    "bios": "$b = Get-CimInstance Win32_BIOS; @{ SerialNumber = $b.SerialNumber; SMBIOSBIOSVersion = $b.SMBIOSBIOSVersion }",
+    "mac": "@{ MacAddress = (Get-NetAdapter | Where-Object { $_.Status -eq 'Up' } | Select-Object -First 1).MacAddress }",
+    "processor": "@{ Name = @(Get-CimInstance Win32_Processor | ForEach-Object { $_.Name }) }",
+    "product": "$p = Get-CimInstance Win32_ComputerSystemProduct; @{ IdentifyingNumber = $p.IdentifyingNumber; UUID = $p.UUID }",
+    "monitor": "$m = Get-CimInstance Win32_DesktopMonitor | Select-Object -First 1; @{ ScreenWidth = $m.ScreenWidth; ScreenHeight = $m.ScreenHeight }",
+    "battery": "$b = Get-CimInstance Win32_Battery | Select-Object -First 1; @{ EstimatedChargeRemaining = $b.EstimatedChargeRemaining; BatteryStatus = $b.BatteryStatus; "
+               "FullChargedCapacity = (Get-CimInstance -Namespace root\\WMI -ClassName BatteryFullChargedCapacity -ErrorAction SilentlyContinue | Select-Object -First 1).FullChargedCapacity }",
+    "firewall": "@{ Enabled = [int](Get-NetFirewallProfile | Select-Object -First 1).Enabled }",
+}
+
+# Identity built from the os, bios and product results, used when a script runs those probes anyway
+PS_IDENTITY_FROM_PROBES = ("@{ UUID = $r['product'].UUID; Name = $env:COMPUTERNAME; LastBootUpTime = $r['os'].LastBootUpTime; "
+                           "SMBIOSBIOSVersion = $r['bios'].SMBIOSBIOSVersion }")
+
+# Sheet fields filled by each probe
+PROBE_FIELDS = {
+    "hostname": ("Computer Name",),
+    "ipv4": ("IPv4 Address(es)",),
+    "wlan": ("Connected Network (SSID)",),
+    "identity": ("Last Boot", "BIOS Version"),
+    "os": ("Operating System", "OS Installation Date", "Windows Version", "Windows Build"),
+    "memory": ("Total RAM (GB)",),
+    "disks": ("Disks",),
+    "computer_system": ("Brand", "Model"),
+    "bios": ("BIOS Serial",),
+    "mac": ("MAC",),
+    "processor": ("Processor (CPU)",),
+    "product": ("System Serial Number",),
+    "monitor": ("Screen Resolution",),
+    "battery": ("Battery - Charge (%)", "Battery - Status", "Battery - Capacity"),
+    "firewall": ("Firewall Enabled",),
+}
+
+# Cache class of each probe; the identity probe is never cached because it validates the cache
+PROBE_TIERS = {
+    "os": "static", "memory": "static", "computer_system": "static", "bios": "static", "processor": "static",
+    "product": "static", "hostname": "static",
+    "mac": "stable", "monitor": "stable", "firewall": "stable",
+    "ipv4": "volatile", "wlan": "volatile", "disks": "volatile", "battery": "volatile",
+}
+
+# Order of the fields in the sheet
+FIELD_ORDER = ("Computer Name", "IPv4 Address(es)", "Connected Network (SSID)", "Operating System", "Total RAM (GB)",
+               "Disks", "Brand", "Model", "BIOS Serial", "MAC", "BIOS Version", "Processor (CPU)", "System Serial Number",
+               "Screen Resolution", "Battery - Charge (%)", "Battery - Status", "Battery - Capacity",
+               "OS Installation Date", "Last Boot", "Windows Version", "Windows Build", "Firewall Enabled")
+
+# Builds one PowerShell script that runs the given probes and prints a single JSON document
+def build_probe_script(names=None):
+    lines = ["[Console]::OutputEncoding = [System.Text.Encoding]::UTF8",  # Emit UTF-8 so Python can decode names and models
+             "$ErrorActionPreference = 'Stop'",  # Turn probe errors into exceptions we can catch
+             "$r = [ordered]@{}"]
+    names = list(names or PS_PROBES)
+    derived = "identity" in names and all(name in names for name in ("os", "bios", "product"))
+    if derived:
+        names.remove("identity")
+        names.append("identity")  # Runs after the probes it reads, so each CIM class is queried once
+    for name in names:
+        probe = PS_IDENTITY_FROM_PROBES if derived and name == "identity" else PS_PROBES[name]
+        lines.append(f"try {{ $r['{name}'] = & {{ {probe} }} }} catch {{ $r['{name}'] = $null }}")  # A failing probe yields null
+    lines.append("$r | ConvertTo-Json -Compress -Depth 4")  # Single JSON document for all probes
+    return "\n".join(lines)
+
+# Parses the JSON printed by a probe script into a dict of raw probe results
+def parse_probe_output(output):
+    start, end = output.find("{"), output.rfind("}")  # Ignore any stray text around the JSON
+    if start == -1 or end < start:
+        return {}
+    try:
+        raw = json.loads(output[start:end + 1])
+    except ValueError:
+        return {}
+    return raw if isinstance(raw, dict) else {}
+
+# Converts a raw JSON value to the text shown in the sheet
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(_text(v) for v in value if v is not None)  # Join multi-valued results (IPs, CPUs)
+    return str(value).strip()
+
+# Builds the sheet data dict from raw probe results
+def build_pc_data(raw):
+    def field(probe, name):
+        values = raw.get(probe)
+        return values.get(name) if isinstance(values, dict) else None
+
     data = {}
-    data['Computer Name'] = run_powershell('hostname')  # Get computer name
-    data['IPv4 Address(es)'] = run_powershell("(Get-NetIPAddress -AddressFamily IPv4 | Where-Object { $_.IPAddress -notlike '169.*' -and $_.IPAddress -ne '127.0.0.1' }).IPAddress -join ', '")  # Get IPv4 addresses
-    data['Connected Network (SSID)'] = run_powershell('(netsh wlan show interfaces) -match "^\\s*SSID\\s*:\\s*(.+)$" | ForEach-Object { ($_ -split ":")[1].Trim() } | Select-Object -First 1')  # Get connected network SSID
-    data['Operating System'] = run_powershell("(Get-CimInstance Win32_OperatingSystem).Caption")  # Get OS name
-    ram_bytes = run_powershell("(Get-CimInstance Win32_PhysicalMemory | Measure-Object -Property Capacity -Sum).Sum")  # Get total RAM in bytes
+    data['Computer Name'] = _text(field("hostname", "Name"))  # Computer name
+    data['IPv4 Address(es)'] = _text(field("ipv4", "IPAddress"))  # IPv4 addresses
+    data['Connected Network (SSID)'] = _text(field("wlan", "SSID"))  # Connected network SSID
+    data['Operating System'] = _text(field("os", "Caption"))  # OS name
     try:
-        ram_gb = round(int(ram_bytes) / (1024**3), 2)  # Convert bytes to GB
+        ram_gb = round(int(field("memory", "Capacity")) / (1024**3), 2)  # Convert bytes to GB
         data['Total RAM (GB)'] = str(ram_gb)  # Store total RAM
-    except ValueError:
+    except (TypeError, ValueError):
         data['Total RAM (GB)'] = "N/A"  # Handle conversion error
-    disks_raw = run_powershell(
-        'Get-CimInstance Win32_LogicalDisk -Filter "DriveType=3" | '
-        'Select-Object DeviceID, @{Name="SizeGB";Expression={[math]::Round($_.Size/1GB,2)}}, '
-        '@{Name="FreeGB";Expression={[math]::Round($_.FreeSpace/1GB,2)}} | '
-        'Format-Table -HideTableHeaders | Out-String')  # Get disk information
+    disks_raw = field("disks", "Disks") or []
+    if isinstance(disks_raw, dict):
+        disks_raw = [disks_raw]  # A single disk may come back as an object instead of a list
     disks = []
-    for line in disks_raw.strip().splitlines():  # Process each line of disk info
-        parts = line.split()
-        if len(parts) == 3:
-            disks.append((parts[0], parts[2], parts[1]))  # Append disk info as tuple
+    for disk in disks_raw:  # Process each disk
+        if isinstance(disk, dict) and disk.get("DeviceID"):
+            disks.append((_text(disk["DeviceID"]), _text(disk.get("FreeGB")), _text(disk.get("SizeGB"))))  # Append disk info as tuple
     if disks:
         data['Disks'] = disks  # Store disk information
-    data['Brand'] = run_powershell("(Get-CimInstance Win32_ComputerSystem).Manufacturer")  # Get computer brand
-    data['Model'] = run_powershell("(Get-CimInstance Win32_ComputerSystem).Model")  # Get computer model
-    data['BIOS Serial'] = run_powershell("(Get-CimInstance Win32_BIOS).SerialNumber")  # Get BIOS serial number
-    data['MAC'] = run_powershell("(Get-NetAdapter | Where-Object {$_.Status -eq 'Up'} | Select-Object -First 1).MacAddress")  # Get MAC address
-    data['BIOS Version'] = run_powershell("(Get-CimInstance Win32_BIOS).SMBIOSBIOSVersion")  # Get BIOS version
-    data['Processor (CPU)'] = run_powershell("(Get-CimInstance Win32_Processor).Name")  # Get CPU name
-    data['System Serial Number'] = run_powershell("(Get-CimInstance Win32_ComputerSystemProduct).IdentifyingNumber")  # Get system serial number
-    width = run_powershell("(Get-CimInstance Win32_DesktopMonitor | Select-Object -First 1).ScreenWidth")  # Get screen width
-    height = run_powershell("(Get-CimInstance Win32_DesktopMonitor | Select-Object -First 1).ScreenHeight")  # Get screen height
-    if width and height and width.isdigit() and height.isdigit():
+    data['Brand'] = _text(field("computer_system", "Manufacturer"))  # Computer brand
+    data['Model'] = _text(field("computer_system", "Model"))  # Computer model
+    data['BIOS Serial'] = _text(field("bios", "SerialNumber"))  # BIOS serial number
+    data['MAC'] = _text(field("mac", "MacAddress"))  # MAC address
+    data['BIOS Version'] = _text(field("identity", "SMBIOSBIOSVersion"))  # BIOS version
+    data['Processor (CPU)'] = _text(field("processor", "Name"))  # CPU name
+    data['System Serial Number'] = _text(field("product", "IdentifyingNumber"))  # System serial number
+    width = _text(field("monitor", "ScreenWidth"))  # Screen width
+    height = _text(field("monitor", "ScreenHeight"))  # Screen height
+    if width.isdigit() and height.isdigit():
         data['Screen Resolution'] = f"{width} x {height}"  # Store screen resolution
-    data['Battery - Charge (%)'] = run_powershell("(Get-WmiObject -Class Win32_Battery | Select-Object -ExpandProperty EstimatedChargeRemaining)")  # Get battery charge percentage
-    data['Battery - Status'] = run_powershell("(Get-WmiObject -Class Win32_Battery | Select-Object -ExpandProperty BatteryStatus)")  # Get battery status
-    data['Battery - Capacity'] = run_powershell("(Get-WmiObject -Namespace root\\WMI -Class BatteryFullChargedCapacity | Select-Object -ExpandProperty FullChargedCapacity)")  # Get battery capacity
-    data['OS Installation Date'] = format_date_wmi(run_powershell("(Get-CimInstance Win32_OperatingSystem).InstallDate"))  # Get OS installation date
-    data['Last Boot'] = format_date_wmi(run_powershell("(Get-CimInstance Win32_OperatingSystem).LastBootUpTime"))  # Get last boot time
-    data['Windows Version'] = run_powershell("(Get-CimInstance Win32_OperatingSystem).Version")  # Get Windows version
-    data['Windows Build'] = run_powershell("(Get-CimInstance Win32_OperatingSystem).BuildNumber")  # Get Windows build number
-    fw_status = run_powershell("(Get-NetFirewallProfile | Select-Object -First 1).Enabled")  # Check if firewall is enabled
-    data['Firewall Enabled'] = "Yes" if fw_status == '1' else "No" if fw_status == '0' else "Unknown"  # Store firewall status
-    return {k: v for k, v in data.items() if v and v != "N/A"}  # Return only valid data
+    data['Battery - Charge (%)'] = _text(field("battery", "EstimatedChargeRemaining"))  # Battery charge percentage
+    data['Battery - Status'] = _text(field("battery", "BatteryStatus"))  # Battery status
+    data['Battery - Capacity'] = _text(field("battery", "FullChargedCapacity"))  # Battery capacity
+    data['OS Installation Date'] = format_date_wmi(_text(field("os", "InstallDate")))  # OS installation date
+    data['Last Boot'] = format_date_wmi(_text(field("identity", "LastBootUpTime")))  # Last boot time
+    data['Windows Version'] = _text(field("os", "Version"))  # Windows version
+    data['Windows Build'] = _text(field("os", "BuildNumber"))  # Windows build number
+    fw_status = _text(field("firewall", "Enabled"))  # Check if firewall is enabled
+    data['Firewall Enabled'] = "Yes" if fw_status in ('1', 'True') else "No" if fw_status in ('0', 'False') else "Unknown"  # Store firewall status
+    for probe, values in raw.items():
+        if values == UNAVAILABLE:  # Probe timed out or was cancelled
+            for key in PROBE_FIELDS.get(probe, ()):
+                data[key] = UNAVAILABLE
+    return {k: data[k] for k in FIELD_ORDER if data.get(k) and data[k] != "N/A"}  # Return only valid data
 
-# Formats the collected data into a readable sheet
-def format_sheet(data):
-    # Titles of keys in Spanish and English
-    titles = {
-        "Computer Name": {"es": "Nombre del equipo", "en": "Computer Name"},
-        "IPv4 Address(es)": {"es": "IP(s) IPv4", "en": "IPv4 Address(es)"},
-        "Connected Network (SSID)": {"es": "Red conectada (SSID)", "en": "Connected Network (SSID)"},
-        "Operating System": {"es": "Sistema operativo", "en": "Operating System"},
-        "Total RAM (GB)": {"es": "RAM total (GB)", "en": "Total RAM (GB)"},
-        "Disks": {"es": "Discos", "en": "Disks"},
-        "Brand": {"es": "Marca", "en": "Brand"},
-        "Model": {"es": "Modelo", "en": "Model"},
-        "BIOS Serial": {"es": "Serial BIOS", "en": "BIOS Serial"},
-        "MAC": {"es": "MAC", "en": "MAC Address"},
-        "BIOS Version": {"es": "Versión BIOS", "en": "BIOS Version"},
-        "Processor (CPU)": {"es": "Procesador (CPU)", "en": "Processor (CPU)"},
-        "System Serial Number": {"es": "Número de serie del sistema", "en": "System Serial Number"},
-        "Screen Resolution": {"es": "Resolución pantalla", "en": "Screen Resolution"},
-        "Battery - Charge (%)": {"es": "Batería - Carga (%)", "en": "Battery - Charge (%)"},
-        "Battery - Status": {"es": "Batería - Estado", "en": "Battery - Status"},
-        "Battery - Capacity": {"es": "Batería - Capacidad", "en": "Battery - Capacity"},
-        "OS Installation Date": {"es": "Fecha de instalación SO", "en": "OS Installation Date"},
-        "Last Boot": {"es": "Último arranque", "en": "Last Boot"},
-        "Windows Version": {"es": "Versión Windows", "en": "Windows Version"},
-        "Windows Build": {"es": "Build Windows", "en": "Windows Build"},
-        "Firewall Enabled": {"es": "Firewall Activado", "en": "Firewall Enabled"},
-    }
+# Nearest-rank percentile of a sorted list
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    return values[max(0, -(-len(values) * pct // 100) - 1)]
 
-    lines = [traducciones[idioma_actual]["titulo"] + "\n" + "="*30 + "\n"]  # Add title and separator
-    for key, value in data.items():  # Iterate through data
-        if key == "Disks":
-            lines.append(titles[key][idioma_actual] + ":")  # Add disks title
-            for d in value:
-                lines.append(f"  {d[0]}: {d[1]} GB free of {d[2]} GB")  # Add disk details
+# Records wall time, status and output size of every probe and pipeline stage (collect, format, pdf, ui)
+class Timings:
+    def __init__(self):
+        self.records = []
+        self.counters = {}  # Named totals such as snapshot cache hits and misses
+        self.lock = threading.Lock()
+
+    def record(self, stage, name, seconds, status="ok", size=0):
+        with self.lock:
+            self.records.append({"stage": stage, "name": name, "ms": round(seconds * 1000, 3), "status": status, "size": size})
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    # Times a block; the block may set "status" and "size" on the dict it gets
+    @contextlib.contextmanager
+    def measure(self, stage, name=""):
+        info = {"status": "ok", "size": 0}
+        start = time.perf_counter()
+        try:
+            yield info
+        except Exception:
+            info["status"] = "error"
+            raise
+        finally:
+            self.record(stage, name, time.perf_counter() - start, info["status"], info["size"])
+
+    # One row per (stage, name): count, p50/p95/max in ms, failed runs and mean output size
+    def summary(self):
+        groups = {}
+        with self.lock:
+            for record in self.records:
+                groups.setdefault((record["stage"], record["name"]), []).append(record)
+        rows = []
+        for (stage, name), records in groups.items():
+            times = sorted(record["ms"] for record in records)
+            rows.append({"stage": stage, "name": name, "count": len(times), "p50_ms": percentile(times, 50),
+                         "p95_ms": percentile(times, 95), "max_ms": times[-1],
+                         "failed": sum(record["status"] not in ("ok", "cached") for record in records),
+                         "mean_size": sum(record["size"] for record in records) // len(records)})
+        return rows
+
+    def to_json(self):
+        with self.lock:
+            records, counters = list(self.records), dict(self.counters)
+        return {"records": records, "summary": self.summary(), "counters": counters}
+
+    def print_summary(self, out=None):
+        out = out or sys.stderr
+        print(f"{'stage':<9} {'name':<18} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'failed':>6} {'size':>7}", file=out)
+        for row in self.summary():
+            print(f"{row['stage']:<9} {row['name']:<18} {row['count']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+                  f"{row['max_ms']:>9.2f} {row['failed']:>6} {row['mean_size']:>7}", file=out)
+        with self.lock:
+            counters = sorted(self.counters.items())
+        for name, value in counters:
+            print(f"{name:<28} {value:>6}", file=out)
+
+    # Writes the records and summary as JSON; "-" prints the summary table to stderr instead
+    def save(self, path):
+        if path == "-":
+            self.print_summary()
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, indent=1)
+
+_timings = None  # Active Timings; None when instrumentation is off
+
+# Turns instrumentation on with a fresh (or the given) Timings and returns it
+def enable_timings(timings=None):
+    global _timings
+    _timings = timings if timings is not None else Timings()
+    return _timings
+
+# Turns instrumentation off and returns the Timings that was active
+def disable_timings():
+    global _timings
+    timings, _timings = _timings, None
+    return timings
+
+# Times a stage when instrumentation is on; costs next to nothing otherwise
+@contextlib.contextmanager
+def timed(stage, name=""):
+    timings = _timings
+    if timings is None:
+        yield {"status": "ok", "size": 0}
+        return
+    with timings.measure(stage, name) as info:
+        yield info
+
+# Adds n to a named counter of the active Timings
+def record_count(name, n=1):
+    timings = _timings
+    if timings is not None:
+        timings.count(name, n)
+
+# Records one probe: status is ok, empty, error, timeout, cancelled or cached; size is the raw result in JSON bytes
+def record_probe(name, seconds, status, result=None):
+    timings = _timings
+    if timings is None:
+        return
+    size = len(json.dumps(result, default=str)) if result is not None and result != UNAVAILABLE else 0
+    timings.record("probe", name, seconds, status, size)
+
+# Cancellation flag shared between the UI and running probes
+class CancelToken:
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    def cancelled(self):
+        return self.event.is_set()
+
+# Runs a single PowerShell probe and returns its raw result
+def powershell_probe(name, timeout=None, runner=run_powershell):
+    output = runner(build_probe_script([name]), timeout)
+    if output.startswith("Error: "):
+        raise PowerShellError(output[len("Error: "):])  # Timeouts, crashes and failed runs are errors, not empty results
+    return parse_probe_output(output).get(name)
+
+# Runs probes concurrently and yields (name, raw result) as each one finishes.
+# A probe that passes its deadline or is cancelled yields UNAVAILABLE and is abandoned.
+# followup(name, result) may return (results to yield now, more probe names to run) after each probe.
+def iter_probes(names, probe, timeout=PROBE_TIMEOUT, cancel=None, max_workers=PROBE_WORKERS, followup=None):
+    pending = list(names)
+    running = {}  # Probe name -> deadline
+    finished = queue.Queue()
+
+    def worker(name):
+        start = time.perf_counter()
+        try:
+            result = probe(name, timeout)
+            status = "empty" if result is None else "ok"
+        except Exception:
+            result, status = None, "error"  # A failing probe simply has no data
+        finished.put((name, result, time.perf_counter() - start, status))
+
+    def done(name, result):
+        yield name, result
+        if followup:
+            ready, more = followup(name, result)
+            yield from ready
+            pending.extend(more)
+
+    while pending or running:
+        if cancel is not None and cancel.cancelled():  # Checked before launching, so nothing starts after a cancel
+            now = time.monotonic()
+            for name in list(running) + pending:
+                record_probe(name, now - running[name] + timeout if name in running else 0.0, "cancelled")
+                yield name, UNAVAILABLE
+            return
+        while pending and len(running) < max_workers:  # Abandoned probes free their slot
+            name = pending.pop(0)
+            running[name] = time.monotonic() + timeout
+            threading.Thread(target=worker, args=(name,), daemon=True).start()
+        wait = max(0.0, min(running.values()) - time.monotonic())
+        try:
+            name, result, seconds, status = finished.get(timeout=min(wait, 0.1))  # Wake up regularly to check for cancellation
+            if running.pop(name, None) is not None:  # Results of abandoned probes are ignored
+                record_probe(name, seconds, status, result)
+                yield from done(name, result)
+        except queue.Empty:
+            pass
+        now = time.monotonic()
+        for name, deadline in list(running.items()):
+            if deadline <= now:
+                del running[name]
+                record_probe(name, timeout, "timeout")
+                yield from done(name, UNAVAILABLE)
+
+# Returns the per-user cache directory of the application
+def cache_dir():
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, NOMBRE_MARCA)
+
+# Probe results persisted per machine; entries are dropped when the machine reboots or its BIOS changes
+class SnapshotCache:
+    def __init__(self, path=None, ttl=None):
+        self.path = path or os.path.join(cache_dir(), "snapshot_cache.json")
+        self.ttl = dict(CACHE_TTL, **(ttl or {}))
+        self.entries = None  # Loaded on first use
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+            self.entries = entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            self.entries = {}  # Missing or corrupt cache: start empty
+        return self.entries
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)  # Never leave a half-written cache behind
+        except OSError:
+            pass  # The cache is only an optimization
+
+    @staticmethod
+    def machine_key(identity):
+        return f"{identity.get('UUID') or ''}|{identity.get('Name') or ''}"
+
+    @staticmethod
+    def fingerprint(identity):
+        return [identity.get("LastBootUpTime"), identity.get("SMBIOSBIOSVersion")]
+
+    # Splits probe names into cached results and names that must be queried again
+    def lookup(self, identity, names, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            entries = self.entries if self.entries is not None else self.load()
+            entry = entries.get(self.machine_key(identity))
+            if entry is None or entry.get("fingerprint") != self.fingerprint(identity):
+                entry = {}  # New boot or BIOS update: nothing cached is trusted
+            cached, stale = {}, []
+            for name in names:
+                record = entry.get("probes", {}).get(name)
+                if record and now - record["time"] < self.ttl[PROBE_TIERS.get(name, "volatile")]:
+                    cached[name] = record["value"]
+                    self.hits += 1
+                else:
+                    stale.append(name)
+                    self.misses += 1
+        record_count("snapshot cache hits", len(cached))
+        record_count("snapshot cache misses", len(stale))
+        return cached, stale
+
+    def store(self, identity, results, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            entries = self.entries if self.entries is not None else self.load()
+            key = self.machine_key(identity)
+            entry = entries.get(key)
+            if entry is None or entry.get("fingerprint") != self.fingerprint(identity):
+                entry = entries[key] = {"fingerprint": self.fingerprint(identity), "probes": {}}
+            for name, value in results.items():
+                if isinstance(value, dict) and self.ttl[PROBE_TIERS.get(name, "volatile")] > 0:  # Failed or unavailable probes are not cached
+                    entry["probes"][name] = {"time": now, "value": value}
+            self.save()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+_snapshot_cache = None
+
+# Returns the shared snapshot cache, creating it on first use
+def get_snapshot_cache():
+    global _snapshot_cache
+    if _snapshot_cache is None:
+        _snapshot_cache = SnapshotCache()
+    return _snapshot_cache
+
+# Runs probes and yields (name, raw result) as they finish, reusing cached results that are still valid for this machine
+def iter_probes_cached(names, probe, cache, timeout=PROBE_TIMEOUT, cancel=None, max_workers=PROBE_WORKERS):
+    names = [name for name in names if name != "identity"]
+    always = [name for name in names if cache.ttl[PROBE_TIERS.get(name, "volatile")] <= 0]
+    cacheable = [name for name in names if name not in always]
+    identity, cached = None, {}
+
+    def followup(name, result):  # Consults the cache as soon as the identity check returns
+        nonlocal identity, cached
+        if name != "identity":
+            return (), ()
+        if not isinstance(result, dict):
+            return (), cacheable  # Cannot validate the cache: query everything
+        identity = result
+        cached, stale = cache.lookup(identity, cacheable)
+        for cached_name, value in cached.items():
+            record_probe(cached_name, 0.0, "cached", value)
+        return cached.items(), stale  # Stale probes join the volatile ones already running
+
+    fresh, seen = {}, set()
+    for name, result in iter_probes(["identity"] + always, probe, timeout, cancel, max_workers, followup):
+        seen.add(name)
+        if name in cacheable and name not in cached:
+            fresh[name] = result
+        yield name, result
+    for name in ["identity"] + names:
+        if name not in seen:  # Cancelled before the identity check: the cached phase never starts
+            record_probe(name, 0.0, "cancelled")
+            yield name, UNAVAILABLE
+    if identity is not None:
+        cache.store(identity, fresh)
+
+# Base class of the data collection backends. A backend runs probes by name and returns
+# raw results shaped like the PowerShell JSON, so build_pc_data() and the formatters work unchanged.
+class Collector:
+    name = "base"
+
+    def probe(self, name, timeout=None):
+        method = getattr(self, "probe_" + name, None)
+        return method() if method else None  # Probes a backend does not support have no data
+
+    # Yields (key, value) sheet fields as each probe finishes; progress(done, total) is called after every probe
+    def iter_collect(self, timeout=PROBE_TIMEOUT, cancel=None, max_workers=PROBE_WORKERS, cache=None, progress=None):
+        names = list(PS_PROBES)
+        if cache is not None:
+            results = iter_probes_cached(names, self.probe, cache, timeout, cancel, max_workers)
         else:
-            lines.append(f"{titles[key][idioma_actual]}: {value}")  # Add other details
-    return "\n".join(lines)  # Return formatted string
+            results = iter_probes(names, self.probe, timeout, cancel, max_workers)
+        with timed("collect", self.name) as info:
+            for done, (name, result) in enumerate(results, 1):
+                fields = build_pc_data({name: result})  # Each field depends only on its own probe
+                for key in PROBE_FIELDS.get(name, ()):
+                    if key in fields:
+                        info["size"] += 1  # Fields collected
+                        yield key, fields[key]
+                if progress:
+                    progress(done, len(names))
+            if cancel is not None and cancel.cancelled():
+                info["status"] = "cancelled"
 
-# Creates a PDF sheet from the collected data
-def create_pdf_sheet(data, file):
+    def collect(self, timeout=PROBE_TIMEOUT, cancel=None, max_workers=PROBE_WORKERS, cache=None):
+        data = dict(self.iter_collect(timeout, cancel, max_workers, cache))
+        return {key: data[key] for key in FIELD_ORDER if key in data}  # Sheet order, not arrival order
+
+# Collects data by running PowerShell scripts; runner(script, timeout) returns the script's stdout
+class PowerShellCollector(Collector):
+    name = "powershell"
+
+    def __init__(self, runner=run_powershell):
+        self.runner = runner
+
+    def probe(self, name, timeout=None):
+        return powershell_probe(name, timeout, self.runner)
+
+# Collects data in-process through WMI/COM (needs the optional 'wmi' package); falls back to PowerShell for the rest
+class WmiCollector(Collector):
+    name = "wmi"
+
+    def __init__(self, fallback=None):
+        self.fallback = fallback or PowerShellCollector()
+
+    def probe(self, name, timeout=None):
+        method = getattr(self, "probe_" + name, None)
+        if method is None:
+            return self.fallback.probe(name, timeout)  # e.g. the SSID is only available through netsh
+        import pythoncom, wmi
+        pythoncom.CoInitialize()  # Probes run on worker threads, each needs its own COM apartment
+        try:
+            return method(wmi)
+        finally:
+            pythoncom.CoUninitialize()
+
+    @staticmethod
+    def _first(items):
+        return items[0] if items else None
+
+    def probe_identity(self, wmi):
+        conn = wmi.WMI()
+        os_info, bios = self._first(conn.Win32_OperatingSystem()), self._first(conn.Win32_BIOS())
+        product = self._first(conn.Win32_ComputerSystemProduct())
+        return {"UUID": product and product.UUID, "Name": os.environ.get("COMPUTERNAME"),
+                "LastBootUpTime": os_info and (os_info.LastBootUpTime or "")[:14],
+                "SMBIOSBIOSVersion": bios and bios.SMBIOSBIOSVersion}
+
+    def probe_hostname(self, wmi):
+        return {"Name": socket.gethostname()}
+
+    def probe_ipv4(self, wmi):
+        addresses = []
+        for adapter in wmi.WMI().Win32_NetworkAdapterConfiguration(IPEnabled=True):
+            addresses += [ip for ip in adapter.IPAddress or () if "." in ip and not ip.startswith("169.") and ip != "127.0.0.1"]
+        return {"IPAddress": addresses}
+
+    def probe_os(self, wmi):
+        os_info = self._first(wmi.WMI().Win32_OperatingSystem())
+        return os_info and {"Caption": os_info.Caption, "Version": os_info.Version, "BuildNumber": os_info.BuildNumber,
+                            "InstallDate": (os_info.InstallDate or "")[:14]}
+
+    def probe_memory(self, wmi):
+        return {"Capacity": sum(int(m.Capacity or 0) for m in wmi.WMI().Win32_PhysicalMemory())}
+
+    def probe_disks(self, wmi):
+        return {"Disks": [{"DeviceID": d.DeviceID, "SizeGB": round(int(d.Size or 0) / 1024**3, 2),
+                           "FreeGB": round(int(d.FreeSpace or 0) / 1024**3, 2)}
+                          for d in wmi.WMI().Win32_LogicalDisk(DriveType=3)]}
+
+    def probe_computer_system(self, wmi):
+        cs = self._first(wmi.WMI().Win32_ComputerSystem())
+        return cs and {"Manufacturer": cs.Manufacturer, "Model": cs.Model}
+
+    def probe_bios(self, wmi):
+        bios = self._first(wmi.WMI().Win32_BIOS())
+        return bios and {"SerialNumber": bios.SerialNumber}
+
+    def probe_mac(self, wmi):
+        adapter = self._first(wmi.WMI().Win32_NetworkAdapter(NetConnectionStatus=2, PhysicalAdapter=True))  # 2 = connected
+        return adapter and {"MacAddress": (adapter.MACAddress or "").replace(":", "-")}
+
+    def probe_processor(self, wmi):
+        return {"Name": [p.Name for p in wmi.WMI().Win32_Processor()]}
+
+    def probe_product(self, wmi):
+        product = self._first(wmi.WMI().Win32_ComputerSystemProduct())
+        return product and {"IdentifyingNumber": product.IdentifyingNumber}
+
+    def probe_monitor(self, wmi):
+        monitor = self._first(wmi.WMI().Win32_DesktopMonitor())
+        return monitor and {"ScreenWidth": monitor.ScreenWidth, "ScreenHeight": monitor.ScreenHeight}
+
+    def probe_battery(self, wmi):
+        battery = self._first(wmi.WMI().Win32_Battery())
+        if battery is None:
+            return None
+        try:
+            capacity = self._first(wmi.WMI(namespace="root/WMI").BatteryFullChargedCapacity())
+        except Exception:
+            capacity = None  # Not every driver exposes the full charged capacity
+        return {"EstimatedChargeRemaining": battery.EstimatedChargeRemaining, "BatteryStatus": battery.BatteryStatus,
+                "FullChargedCapacity": capacity and capacity.FullChargedCapacity}
+
+    def probe_firewall(self, wmi):
+        profile = self._first(wmi.WMI(namespace="root/StandardCimv2").MSFT_NetFirewallProfile())
+        return profile and {"Enabled": int(profile.Enabled)}
+
+# Linux power_supply status mapped to Win32_Battery.BatteryStatus codes
+LINUX_BATTERY_STATUS = {"Discharging": 1, "Not charging": 2, "Unknown": 2, "Full": 3, "Charging": 6}
+
+# Collects data in-process from /proc, /sys and os.statvfs on Linux; root points at an alternative tree (e.g. a CI fixture)
+class LinuxCollector(Collector):
+    name = "linux"
+
+    def __init__(self, root="/"):
+        self.root = root
+        self.live = os.path.realpath(root) == os.path.realpath("/")  # Kernel calls (hostname, ioctl) only describe the running system
+
+    def _read(self, *parts):
+        try:
+            with open(os.path.join(self.root, *parts), encoding="utf-8", errors="replace") as f:
+                return f.read().strip()
+        except OSError:
+            return None  # Missing file or no permission (e.g. DMI serials need root)
+
+    def _list(self, *parts):
+        try:
+            return sorted(os.listdir(os.path.join(self.root, *parts)))
+        except OSError:
+            return []
+
+    def _dmi(self, name):
+        return self._read("sys/class/dmi/id", name)
+
+    def _boot_time(self):
+        for line in (self._read("proc/stat") or "").splitlines():
+            if line.startswith("btime "):
+                return datetime.fromtimestamp(int(line.split()[1])).strftime("%Y%m%d%H%M%S")
+        return None
+
+    def _hostname(self):
+        return self._read("proc/sys/kernel/hostname") or (socket.gethostname() if self.live else None)
+
+    def probe_identity(self):
+        return {"UUID": self._dmi("product_uuid") or self._read("etc/machine-id"), "Name": self._hostname(),
+                "LastBootUpTime": self._boot_time(), "SMBIOSBIOSVersion": self._dmi("bios_version")}
+
+    def probe_hostname(self):
+        return {"Name": self._hostname()}
+
+    def probe_ipv4(self):
+        addresses, previous = [], None
+        for line in (self._read("proc/net/fib_trie") or "").splitlines():  # Local addresses are listed as "/32 host LOCAL"
+            line = line.strip()
+            if line.startswith("/32 host LOCAL") and previous and previous not in addresses:
+                if not previous.startswith(("127.", "169.254.")):
+                    addresses.append(previous)
+            previous = line.split()[-1] if line.startswith(("|--", "+--")) else previous
+        return {"IPAddress": addresses}
+
+    def probe_wlan(self):
+        if not self.live:
+            return None  # The SSID comes from the kernel, not from a file under root
+        import array, fcntl, struct
+        interfaces = [line.split(":")[0].strip() for line in (self._read("proc/net/wireless") or "").splitlines()[2:]]
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for interface in interfaces:
+                buffer = array.array("B", bytes(33))
+                request = struct.pack("16sPHH", interface.encode()[:15], buffer.buffer_info()[0], len(buffer), 0).ljust(32, b"\0")
+                try:
+                    length = struct.unpack("16sPHH", fcntl.ioctl(sock.fileno(), 0x8B1B, request)[:struct.calcsize("16sPHH")])[2]  # SIOCGIWESSID
+                except OSError:
+                    continue
+                if length:
+                    return {"SSID": buffer.tobytes()[:length].decode("utf-8", "replace")}
+        return None
+
+    def probe_os(self):
+        release = dict(line.split("=", 1) for line in (self._read("etc/os-release") or self._read("usr/lib/os-release") or "").splitlines() if "=" in line)
+        return {"Caption": release.get("PRETTY_NAME", "").strip('"') or None}  # Version and build are Windows-only fields
+
+    def probe_memory(self):
+        for line in (self._read("proc/meminfo") or "").splitlines():
+            if line.startswith("MemTotal:"):
+                return {"Capacity": int(line.split()[1]) * 1024}
+        return None
+
+    def probe_disks(self):
+        disks, seen = [], set()
+        for line in (self._read("proc/mounts") or "").splitlines():
+            device, mount_point = line.split()[:2]
+            if not device.startswith("/dev/") or device.startswith("/dev/loop") or device in seen:
+                continue  # Only real block devices, each one once
+            try:
+                stats = os.statvfs(os.path.join(self.root, mount_point.replace("\\040", " ").lstrip("/")))
+            except OSError:
+                continue
+            seen.add(device)
+            disks.append({"DeviceID": mount_point, "SizeGB": round(stats.f_blocks * stats.f_frsize / 1024**3, 2),
+                          "FreeGB": round(stats.f_bavail * stats.f_frsize / 1024**3, 2)})
+        return {"Disks": disks}
+
+    def probe_computer_system(self):
+        return {"Manufacturer": self._dmi("sys_vendor"), "Model": self._dmi("product_name")}
+
+    def probe_bios(self):
+        return {"SerialNumber": self._dmi("product_serial")}
+
+    def probe_mac(self):
+        for interface in self._list("sys/class/net"):
+            if interface != "lo" and self._read("sys/class/net", interface, "operstate") == "up":
+                return {"MacAddress": (self._read("sys/class/net", interface, "address") or "").upper().replace(":", "-")}
+        return None
+
+    def probe_processor(self):
+        names, physical_id = {}, "0"
+        for line in (self._read("proc/cpuinfo") or "").splitlines():
+            key, _, value = line.partition(":")
+            key = key.strip()
+            if key == "physical id":
+                physical_id = value.strip()
+            elif key == "model name":
+                names[physical_id] = value.strip()  # One name per socket, like Win32_Processor
+        return {"Name": list(names.values())}
+
+    def probe_product(self):
+        return {"IdentifyingNumber": self._dmi("product_serial")}
+
+    def probe_monitor(self):
+        for connector in self._list("sys/class/drm"):
+            if self._read("sys/class/drm", connector, "status") == "connected":
+                mode = (self._read("sys/class/drm", connector, "modes") or "").split("\n")[0]
+                width, _, height = mode.partition("x")
+                if width.isdigit() and height.isdigit():
+                    return {"ScreenWidth": int(width), "ScreenHeight": int(height)}
+        return None
+
+    def probe_battery(self):
+        for supply in self._list("sys/class/power_supply"):
+            if self._read("sys/class/power_supply", supply, "type") != "Battery":
+                continue
+            read = lambda name: self._read("sys/class/power_supply", supply, name)
+            capacity = None
+            if (read("energy_full") or "").isdigit():
+                capacity = int(read("energy_full")) // 1000  # uWh -> mWh
+            elif (read("charge_full") or "").isdigit() and (read("voltage_min_design") or "").isdigit():
+                capacity = int(read("charge_full")) * int(read("voltage_min_design")) // 10**9  # uAh * uV -> mWh
+            charge = read("capacity")
+            return {"EstimatedChargeRemaining": int(charge) if (charge or "").isdigit() else None,
+                    "BatteryStatus": LINUX_BATTERY_STATUS.get(read("status")), "FullChargedCapacity": capacity}
+        return None
+
+# Returns the collector for this platform; backend forces "powershell", "wmi" or "linux"
+def get_collector(backend=None):
+    backend = backend or os.environ.get("SHEETXPERT_BACKEND")
+    if backend is None:
+        if sys.platform.startswith("linux"):
+            backend = "linux"
+        else:
+            try:
+                import wmi  # Optional dependency for the native Windows backend
+                backend = "wmi"
+            except ImportError:
+                backend = "powershell"
+    return {"powershell": PowerShellCollector, "wmi": WmiCollector, "linux": LinuxCollector}[backend]()
+
+# Collects various data about the PC. runner(script, timeout) forces the PowerShell backend with a custom runner
+def get_pc_data(runner=None, timeout=PROBE_TIMEOUT, cancel=None, max_workers=PROBE_WORKERS, cache=None, collector=None):
+    collector = collector or (PowerShellCollector(runner) if runner else get_collector())
+    return collector.collect(timeout, cancel, max_workers, cache)
+
+# Same as get_pc_data(), but yields (key, value) fields as soon as their probe finishes
+def iter_pc_data(runner=None, timeout=PROBE_TIMEOUT, cancel=None, max_workers=PROBE_WORKERS, cache=None, collector=None, progress=None):
+    collector = collector or (PowerShellCollector(runner) if runner else get_collector())
+    return collector.iter_collect(timeout, cancel, max_workers, cache, progress)
+
+# True when the fields that name the PDF file have arrived with a real value
+def has_required_fields(data):
+    return all(data.get(key) not in (None, "", UNAVAILABLE) for key in REQUIRED_FIELDS)
+
+# Returns the fields in sheet order
+def sheet_order(data):
+    return {key: data[key] for key in FIELD_ORDER if key in data}
+
+# Collected sheet data frozen in sheet order. It cannot be changed, so its digest can key the render cache.
+class Snapshot(Mapping):
+    def __init__(self, data):
+        items = []
+        for key in FIELD_ORDER:
+            if key in data:
+                value = data[key]
+                if key == "Disks" and isinstance(value, (list, tuple)):
+                    value = tuple(tuple(d) for d in value)
+                items.append((key, value))
+        self._data = dict(items)
+        self.digest = hashlib.sha1(json.dumps(items, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __hash__(self):
+        return hash(self.digest)
+
+    def __repr__(self):
+        return f"Snapshot({self._data!r})"
+
+# Titles of the sheet fields in Spanish and English
+titulos_campos = {
+    "Computer Name": {"es": "Nombre del equipo", "en": "Computer Name"},
+    "IPv4 Address(es)": {"es": "IP(s) IPv4", "en": "IPv4 Address(es)"},
+    "Connected Network (SSID)": {"es": "Red conectada (SSID)", "en": "Connected Network (SSID)"},
+    "Operating System": {"es": "Sistema operativo", "en": "Operating System"},
+    "Total RAM (GB)": {"es": "RAM total (GB)", "en": "Total RAM (GB)"},
+    "Disks": {"es": "Discos", "en": "Disks"},
+    "Brand": {"es": "Marca", "en": "Brand"},
+    "Model": {"es": "Modelo", "en": "Model"},
+    "BIOS Serial": {"es": "Serial BIOS", "en": "BIOS Serial"},
+    "MAC": {"es": "MAC", "en": "MAC Address"},
+    "BIOS Version": {"es": "Versión BIOS", "en": "BIOS Version"},
+    "Processor (CPU)": {"es": "Procesador (CPU)", "en": "Processor (CPU)"},
+    "System Serial Number": {"es": "Número de serie del sistema", "en": "System Serial Number"},
+    "Screen Resolution": {"es": "Resolución pantalla", "en": "Screen Resolution"},
+    "Battery - Charge (%)": {"es": "Batería - Carga (%)", "en": "Battery - Charge (%)"},
+    "Battery - Status": {"es": "Batería - Estado", "en": "Battery - Status"},
+    "Battery - Capacity": {"es": "Batería - Capacidad", "en": "Battery - Capacity"},
+    "OS Installation Date": {"es": "Fecha de instalación SO", "en": "OS Installation Date"},
+    "Last Boot": {"es": "Último arranque", "en": "Last Boot"},
+    "Windows Version": {"es": "Versión Windows", "en": "Windows Version"},
+    "Windows Build": {"es": "Build Windows", "en": "Windows Build"},
+    "Firewall Enabled": {"es": "Firewall Activado", "en": "Firewall Enabled"},
+}
+
+# Builds the labels of one language, shared by format_sheet() and SheetRenderer
+def compile_labels(lang):
+    return {
+        "title": traducciones[lang]["titulo"],
+        "header": traducciones[lang]["titulo"] + "\n" + "="*30 + "\n",  # Title and separator of the text sheet
+        "names": {key: titles[lang] for key, titles in titulos_campos.items()},  # Table headers
+        "fields": {key: titles[lang] + ":" for key, titles in titulos_campos.items()},  # Field labels
+        "unavailable": traducciones[lang]["no_disponible"],
+    }
+
+etiquetas = {lang: compile_labels(lang) for lang in traducciones}  # Compiled labels per language
+
+# Formats the collected data into a readable sheet
+def format_sheet(data, lang=None):
+    lang = lang or idioma_actual  # Language of the sheet
+    labels = etiquetas[lang]
+    fields = labels["fields"]
+    with timed("format", "format_sheet") as info:
+        lines = [labels["header"]]  # Add title and separator
+        for key, value in data.items():  # Iterate through data
+            if value == UNAVAILABLE:
+                lines.append(f"{fields[key]} {labels['unavailable']}")  # Probe timed out
+            elif key == "Disks":
+                lines.append(fields[key])  # Add disks title
+                for d in value:
+                    lines.append(f"  {d[0]}: {d[1]} GB free of {d[2]} GB")  # Add disk details
+            else:
+                lines.append(f"{fields[key]} {value}")  # Add other details
+        sheet = "\n".join(lines)
+        info["size"] = len(sheet)
+    return sheet  # Return formatted string
+
+# Original PDF renderer, kept as the baseline for the PDF benchmark
+def create_pdf_sheet_legacy(data, file, lang=None):
+    from fpdf import FPDF  # Imported on first use
+    lang = lang or idioma_actual  # Language of the sheet
     pdf = FPDF()  # Create a PDF object
     pdf.add_page()  # Add a new page
     pdf.set_auto_page_break(auto=True, margin=15)  # Set auto page break
@@ -159,7 +1165,7 @@ def create_pdf_sheet(data, file):
     pdf.set_font("Arial", 'B', 18)  # Set font for title
     
     # Add title and handle encoding
-    title = traducciones[idioma_actual]["titulo"].encode('latin-1', 'replace').decode('latin-1')  # Encode title
+    title = traducciones[lang]["titulo"].encode('latin-1', 'replace').decode('latin-1')  # Encode title
     pdf.cell(0, 15, title, 0, 1, 'C', fill=True)  # Add title to PDF
     
     pdf.ln(5)  # Add a line break
@@ -170,41 +1176,18 @@ def create_pdf_sheet(data, file):
     pdf.line(10, pdf.get_y(), 200, pdf.get_y())  # Draw a line
     pdf.ln(5)  # Add a line break
 
-    # Use translated titles when generating pdf
-    titles = {
-        "Computer Name": {"es": "Nombre del equipo", "en": "Computer Name"},
-        "IPv4 Address(es)": {"es": "IP(s) IPv4", "en": "IPv4 Address(es)"},
-        "Connected Network (SSID)": {"es": "Red conectada (SSID)", "en": "Connected Network (SSID)"},
-        "Operating System": {"es": "Sistema operativo", "en": "Operating System"},
-        "Total RAM (GB)": {"es": "RAM total (GB)", "en": "Total RAM (GB)"},
-        "Disks": {"es": "Discos", "en": "Disks"},
-        "Brand": {"es": "Marca", "en": "Brand"},
-        "Model": {"es": "Modelo", "en": "Model"},
-        "BIOS Serial": {"es": "Serial BIOS", "en": "BIOS Serial"},
-        "MAC": {"es": "MAC", "en": "MAC Address"},
-        "BIOS Version": {"es": "Versión BIOS", "en": "BIOS Version"},
-        "Processor (CPU)": {"es": "Procesador (CPU)", "en": "Processor (CPU)"},
-        "System Serial Number": {"es": "Número de serie del sistema", "en": "System Serial Number"},
-        "Screen Resolution": {"es": "Resolución pantalla", "en": "Screen Resolution"},
-        "Battery - Charge (%)": {"es": "Batería - Carga (%)", "en": "Battery - Charge (%)"},
-        "Battery - Status": {"es": "Batería - Estado", "en": "Battery - Status"},
-        "Battery - Capacity": {"es": "Batería - Capacidad", "en": "Battery - Capacity"},
-        "OS Installation Date": {"es": "Fecha de instalación SO", "en": "OS Installation Date"},
-        "Last Boot": {"es": "Último arranque", "en": "Last Boot"},
-        "Windows Version": {"es": "Versión Windows", "en": "Windows Version"},
-        "Windows Build": {"es": "Build Windows", "en": "Windows Build"},
-        "Firewall Enabled": {"es": "Firewall Activado", "en": "Firewall Enabled"},
-    }
     for key, value in data.items():  # Iterate through data
-        if key == "Disks":
+        if value == UNAVAILABLE:
+            value = traducciones[lang]["no_disponible"]  # Probe timed out
+        if key == "Disks" and isinstance(value, list):
             pdf.set_font("Arial", 'B', 12)  # Set font for disks
-            pdf.cell(0, 10, titles[key][idioma_actual] + ":", 0, 1)  # Add disks title
+            pdf.cell(0, 10, titulos_campos[key][lang] + ":", 0, 1)  # Add disks title
             pdf.set_font("Arial", '', 12)  # Set font for disk details
             for d in value:
                 pdf.cell(0, 8, f"  {d[0]}: {d[1]} GB free of {d[2]} GB", 0, 1)  # Add disk details
         else:
             pdf.set_font("Arial", 'B', 12)  # Set font for other details
-            pdf.cell(50, 10, f"{titles[key][idioma_actual]}:", 0, 0)  # Add title for the key
+            pdf.cell(50, 10, f"{titulos_campos[key][lang]}:", 0, 0)  # Add title for the key
             pdf.set_font("Arial", '', 12)  # Set font for value
             # Handle encoding
             value = str(value).encode('latin-1', 'replace').decode('latin-1')  # Encode value
@@ -212,6 +1195,266 @@ def create_pdf_sheet(data, file):
 
     pdf.output(file)  # Save the PDF to the specified file
 
+# Returns the bytes of a finished FPDF document
+def _pdf_bytes(pdf):
+    output = pdf.output(dest='S')
+    return output.encode('latin-1') if isinstance(output, str) else bytes(output)  # PyFPDF returns latin-1 text
+
+# Replaces the creation date written by FPDF (same length, so offsets stay valid); equal sheets give equal bytes
+def _pin_creation_date(buffer, creation_date):
+    stamp = creation_date.strftime("%Y%m%d%H%M%S").encode("ascii")
+    return re.sub(rb"(/CreationDate \(D:)\d{14}", lambda m: m.group(1) + stamp, buffer, count=1)
+
+_pdf_class_cache = []
+
+# Returns the FPDF class used by SheetRenderer. PyFPDF 1.x appends every line of the finished
+# document to one string, which is quadratic in the document size; the subclass collects the
+# lines in a list, tracks their length for object offsets and joins them only when the buffer is read.
+def _pdf_class():
+    if not _pdf_class_cache:
+        import fpdf  # Imported on first use
+        FPDF = fpdf.FPDF
+        if not str(getattr(fpdf, "FPDF_VERSION", "")).startswith("1."):
+            _pdf_class_cache.append(FPDF)  # fpdf2 already builds its output efficiently
+        else:
+            class BufferedFPDF(FPDF):
+                @property
+                def buffer(self):
+                    parts = self.__dict__.setdefault("_parts", [])
+                    if len(parts) > 1:
+                        parts[:] = ["".join(parts)]
+                    return parts[0] if parts else ""
+
+                @buffer.setter
+                def buffer(self, value):
+                    self.__dict__["_parts"] = [value]
+                    self.__dict__["_size"] = len(value)
+
+                def _out(self, s):
+                    if self.state == 2:
+                        return FPDF._out(self, s)  # Page content is kept per page as before
+                    if isinstance(s, bytes):
+                        s = s.decode("latin1")
+                    elif not isinstance(s, str):
+                        s = str(s)
+                    self.__dict__["_parts"].append(s + "\n")
+                    self.__dict__["_size"] += len(s) + 1
+
+                def _newobj(self):
+                    self.n += 1
+                    self.offsets[self.n] = self.__dict__["_size"]  # Same value as len(self.buffer), without joining
+                    self._out(str(self.n) + ' 0 obj')
+
+            _pdf_class_cache.append(BufferedFPDF)
+    return _pdf_class_cache[0]
+
+# Encodes text for the core PDF fonts
+def _latin1(text):
+    return str(text).encode('latin-1', 'replace').decode('latin-1')
+
+# Fields of the consolidated table: (key, column width in mm)
+TABLE_COLUMNS = (("Computer Name", 40), ("Brand", 30), ("Model", 45), ("System Serial Number", 35),
+                 ("Processor (CPU)", 62), ("Total RAM (GB)", 20), ("Operating System", 45))
+
+# PDF renderer with the static parts of the sheet (title, labels, fonts) prepared once per language.
+# It draws exactly what create_pdf_sheet_legacy() draws, so the output is byte-identical for the same creation date.
+class SheetRenderer:
+    def __init__(self, lang=None):
+        self.lang = lang or idioma_actual
+        labels = etiquetas[self.lang]
+        self.title = _latin1(labels["title"])
+        self.labels = {key: _latin1(label) for key, label in labels["fields"].items()}
+        self.unavailable = _latin1(labels["unavailable"])
+        self.headers = [_latin1(labels["names"][key]) for key, _ in TABLE_COLUMNS]
+
+    def _new_pdf(self, orientation='P'):
+        pdf = _pdf_class()(orientation)  # Create a PDF object
+        pdf.set_auto_page_break(auto=True, margin=15)  # Set auto page break
+        return pdf
+
+    def _value(self, pdf, value):
+        cw = pdf.current_font.get('cw') if isinstance(pdf.current_font, dict) else None  # fpdf2 fonts are objects: use multi_cell
+        if getattr(pdf, 'unifontsubset', None) is False and isinstance(cw, dict) and '\n' not in value and '\r' not in value:
+            w = pdf.w - pdf.r_margin - pdf.x
+            if sum(cw.get(c, 0) for c in value) <= (w - 2 * pdf.c_margin) * 1000.0 / pdf.font_size:
+                pdf.cell(w, 10, value, 0, 2, 'J')  # Single line: what multi_cell would draw, without its line-breaking loop
+                pdf.x = pdf.l_margin
+                return
+        pdf.multi_cell(0, 10, value)  # Add value to PDF
+
+    def _page(self, pdf, data):
+        pdf.add_page()  # Add a new page
+        pdf.set_fill_color(25, 118, 210)  # Set fill color for title
+        pdf.set_text_color(255, 255, 255)  # Set text color for title
+        pdf.set_font("Arial", 'B', 18)  # Set font for title
+        pdf.cell(0, 15, self.title, 0, 1, 'C', fill=True)  # Add title to PDF
+        pdf.ln(5)  # Add a line break
+        pdf.set_text_color(33, 33, 33)  # Set text color for content
+        pdf.set_font("Arial", 'B', 12)  # Set font for content
+        pdf.set_draw_color(25, 118, 210)  # Set line color
+        pdf.set_line_width(0.8)  # Set line width
+        pdf.line(10, pdf.get_y(), 200, pdf.get_y())  # Draw a line
+        pdf.ln(5)  # Add a line break
+        for key, value in data.items():  # Iterate through data
+            pdf.set_font("Arial", 'B', 12)  # Bold label
+            if key == "Disks" and isinstance(value, (list, tuple)):
+                pdf.cell(0, 10, self.labels[key], 0, 1)  # Add disks title
+                pdf.set_font("Arial", '', 12)  # Set font for disk details
+                for d in value:
+                    pdf.cell(0, 8, f"  {d[0]}: {d[1]} GB free of {d[2]} GB", 0, 1)  # Add disk details
+            else:
+                pdf.cell(50, 10, self.labels[key], 0, 0)  # Add title for the key
+                pdf.set_font("Arial", '', 12)  # Set font for value
+                self._value(pdf, self.unavailable if value == UNAVAILABLE else _latin1(value))
+
+    def _finish(self, pdf, file, creation_date):
+        buffer = _pdf_bytes(pdf)
+        if creation_date is not None:
+            buffer = _pin_creation_date(buffer, creation_date)
+        if file:
+            with open(file, 'wb') as f:
+                f.write(buffer)  # Save the PDF to the specified file
+        return buffer
+
+    # Renders one sheet; returns the PDF bytes and writes them to file if given
+    def render(self, data, file=None, creation_date=None):
+        pdf = self._new_pdf()
+        self._page(pdf, data)
+        return self._finish(pdf, file, creation_date)
+
+    # Renders many sheets into one document, one page per machine
+    def render_pages(self, datas, file=None, creation_date=None):
+        document = SheetDocument(self, "pages")
+        for data in datas:
+            document.add(data)
+        return document.finish(file, creation_date)
+
+    def _table_header(self, pdf):
+        pdf.add_page()
+        pdf.set_font("Arial", 'B', 14)
+        pdf.set_text_color(25, 118, 210)
+        pdf.cell(0, 10, self.title, 0, 1, 'C')  # Document title on every page
+        pdf.set_font("Arial", 'B', 8)
+        pdf.set_fill_color(25, 118, 210)
+        pdf.set_text_color(255, 255, 255)
+        for header, (_, width) in zip(self.headers, TABLE_COLUMNS):
+            pdf.cell(width, 7, self._fit(pdf, header, width), 1, 0, 'L', fill=True)
+        pdf.ln()
+        pdf.set_font("Arial", '', 8)
+        pdf.set_text_color(33, 33, 33)
+
+    @staticmethod
+    def _fit(pdf, text, width):
+        while text and pdf.get_string_width(text) > width - 2:  # Truncate to the column width
+            text = text[:-1]
+        return text
+
+    def _new_table(self):
+        pdf = self._new_pdf('L')
+        pdf.set_auto_page_break(False)  # Page breaks are handled here so the header is repeated
+        self._table_header(pdf)
+        return pdf
+
+    def _table_row(self, pdf, data):
+        if pdf.get_y() + 6 > pdf.h - 15:
+            self._table_header(pdf)
+        for key, width in TABLE_COLUMNS:
+            value = data.get(key, "")
+            pdf.cell(width, 6, self._fit(pdf, self.unavailable if value == UNAVAILABLE else _latin1(value), width), 1, 0)
+        pdf.ln()
+
+    # Renders many machines as one consolidated table, one row per machine
+    def render_table(self, datas, file=None, creation_date=None):
+        document = SheetDocument(self, "table")
+        for data in datas:
+            document.add(data)
+        return document.finish(file, creation_date)
+
+# Multi-machine PDF filled one machine at a time: kind is "pages" (one page each) or "table" (one row each)
+class SheetDocument:
+    def __init__(self, renderer, kind):
+        self.renderer = renderer
+        self.pdf = renderer._new_pdf() if kind == "pages" else renderer._new_table()
+        self.add_machine = renderer._page if kind == "pages" else renderer._table_row
+
+    def add(self, data):
+        self.add_machine(self.pdf, data)
+
+    # Returns the PDF bytes and writes them to file if given
+    def finish(self, file=None, creation_date=None):
+        return self.renderer._finish(self.pdf, file, creation_date)
+
+_sheet_renderers = {}
+
+# Returns the shared renderer for a language
+def get_sheet_renderer(lang=None):
+    lang = lang or idioma_actual
+    if lang not in _sheet_renderers:
+        _sheet_renderers[lang] = SheetRenderer(lang)
+    return _sheet_renderers[lang]
+
+# Renders the PDF of a sheet for the render cache; timed like create_pdf_sheet (format_sheet times itself)
+def render_pdf_bytes(snapshot, lang=None):
+    with timed("pdf", "render_sheet") as info:
+        pdf = get_sheet_renderer(lang).render(snapshot)
+        info["size"] = len(pdf)
+    return pdf
+
+# Output formats of the render cache: format -> function(snapshot, lang)
+RENDER_FORMATS = {
+    "txt": lambda snapshot, lang: format_sheet(snapshot, lang),
+    "pdf": lambda snapshot, lang: render_pdf_bytes(snapshot, lang),
+}
+
+# Rendered sheets keyed by (snapshot digest, language, format); the least recently used is evicted first
+class RenderCache:
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, data, lang=None, fmt="txt"):
+        snapshot = data if isinstance(data, Snapshot) else Snapshot(data)
+        key = (snapshot.digest, lang or idioma_actual, fmt)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+        rendered = RENDER_FORMATS[fmt](snapshot, key[1])  # Rendered outside the lock
+        with self.lock:
+            self.entries[key] = rendered
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return rendered
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+_render_cache = None
+current_snapshot = None  # Sheet shown in the window once a collection has finished
+
+# Returns the shared render cache
+def get_render_cache():
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = RenderCache()
+    return _render_cache
+
+# Returns the sheet as text ("txt") or PDF bytes ("pdf"), rendering it only if it is not cached
+def render_sheet(data, lang=None, fmt="txt"):
+    return get_render_cache().get(data, lang, fmt)
+
+# Creates a PDF sheet from the collected data
+def create_pdf_sheet(data, file, lang=None):
+    with timed("pdf", "create_pdf_sheet") as info:
+        info["size"] = len(get_sheet_renderer(lang).render(data, file))
+
 # Returns the absolute path of a resource file
 def resource_path(relative_path):
     try:
@@ -228,76 +1471,144 @@ def center_window(win, width, height):
     y = int((screen_height / 2) - (height / 2))  # Calculate y position
     win.geometry(f"{width}x{height}+{x}+{y}")  # Set window size and position
 
-# Displays the sheet and saves it as a PDF
-def show_sheet_and_save(data, sheet, window, text_area):
-    center_window(window, 700, 600)  # Center the window
-    text_area.grid()  # Show the text area
-    text_area.delete(1.0, tk.END)  # Clear previous content
-    text_area.insert(tk.END, sheet)  # Insert the new sheet content
+# Shows the (possibly partial) sheet in the text area
+def show_sheet(text_area, sheet):
+    with timed("ui", "show_sheet") as info:
+        text_area.delete(1.0, tk.END)  # Clear previous content
+        text_area.insert(tk.END, sheet)  # Insert the new sheet content
+        info["size"] = len(sheet)
+
+# Asks where to save the PDF; returns the chosen file or an empty string
+def ask_pdf_file(data):
     computer_name = data.get('Computer Name', 'Computer')  # Get computer name
     date_time = datetime.now().strftime("%Y%m%d_%H%M%S")  # Get current date and time
     prefix_name = traducciones[idioma_actual].get("nombre_archivo_prefijo", "Sheet" if idioma_actual == "en" else "Ficha")  # Get file prefix
     suggested_name = f"{prefix_name}_{computer_name}_{date_time}.pdf"  # Create suggested file name
-    file = filedialog.asksaveasfilename (defaultextension=".pdf",
-                                           filetypes=[("PDF files", "*.pdf")],
-                                           title=traducciones[idioma_actual]["guardar_como"],
-                                           initialfile=suggested_name)  # Open save dialog for PDF
-    if file:  # If a file was selected
-        try:
-            print(f"Attempting to save PDF at: {file}")  # Debug message
-            create_pdf_sheet(data, file)  # Create the PDF sheet
-            messagebox.showinfo(traducciones[idioma_actual]["exito_titulo"], traducciones[idioma_actual]["exito_msj"].format(file))  # Show success message
-        except Exception as e:
-            print(f"Error saving PDF: {e}")  # Debug message
-            messagebox.showerror(traducciones[idioma_actual]["error_titulo"], traducciones[idioma_actual]["error_msj"].format(e))  # Show error message
+    return filedialog.asksaveasfilename(defaultextension=".pdf",
+                                        filetypes=[("PDF files", "*.pdf")],
+                                        title=traducciones[idioma_actual]["guardar_como"],
+                                        initialfile=suggested_name)  # Open save dialog for PDF
+
+# Saves the sheet shown in the window as a PDF and reports the result
+def save_pdf_sheet(data, file):
+    try:
+        print(f"Attempting to save PDF at: {file}")  # Debug message
+        pdf = _pin_creation_date(render_sheet(data, idioma_actual, "pdf"), datetime.now())  # From the render cache, dated now
+        with open(file, 'wb') as f:
+            f.write(pdf)  # Save the PDF to the specified file
+        messagebox.showinfo(traducciones[idioma_actual]["exito_titulo"], traducciones[idioma_actual]["exito_msj"].format(file))  # Show success message
+    except Exception as e:
+        print(f"Error saving PDF: {e}")  # Debug message
+        messagebox.showerror(traducciones[idioma_actual]["error_titulo"], traducciones[idioma_actual]["error_msj"].format(e))  # Show error message
 
 # Changes the language of the UI
 def change_language():
-    global idioma_actual, header, btn_obtain, btn_language
+    global idioma_actual, header, btn_obtain, btn_language, btn_cancel, btn_save
     idioma_actual = "en" if idioma_actual == "es" else "es"  # Toggle language
     header.config(text=traducciones[idioma_actual]["titulo"])  # Update header text
     btn_obtain.config(text=traducciones[idioma_actual]["obtener_ficha"])  # Update button text
     btn_language.config(text=traducciones[idioma_actual]["idioma_btn"])  # Update language button text
+    btn_cancel.config(text=traducciones[idioma_actual]["cancelar"])  # Update cancel button text
+    btn_save.config(text=traducciones[idioma_actual]["guardar_pdf"])  # Update save button text
+    if current_snapshot is not None:
+        show_sheet(text_area, render_sheet(current_snapshot))  # Same data in the new language, from the render cache
 
-# Creates a splash window that appears on startup
-def splash_window():
-    splash = tk.Tk()  # Create a new Tkinter window
-    splash.overrideredirect(True)  # Remove window decorations
-    splash.configure(bg="white")  # Set background color
-    splash_width, splash_height = 200, 200  # Set splash window size
-    screen_width = splash.winfo_screenwidth()  # Get screen width
-    screen_height = splash.winfo_screenheight()  # Get screen height
-    x = (screen_width // 2) - (splash_width // 2)  # Calculate x position
-    y = (screen_height // 2) - (splash_height // 2)  # Calculate y position
-    splash.geometry(f"{splash_width}x{splash_height}+{x}+{y}")  # Set window size and position
-    icon_path = resource_path(ICONO_NOMBRE)  # Get icon path
-    try:
-        splash.iconbitmap(icon_path)  # Set window icon
-    except Exception:
-        pass  # Ignore errors if icon cannot be set
+# Records how long a startup phase takes
+@contextlib.contextmanager
+def startup_phase(name):
+    start = time.perf_counter()
     try:
-        image_path = resource_path(IMAGEN_SPLASH)  # Get splash image path
-        image = Image.open(image_path)  # Open image
-        image = image.resize((splash_width, splash_height), Image.LANCZOS)  # Resize image
-        photo = ImageTk.PhotoImage(image)  # Create PhotoImage object
-        label = tk.Label(splash, image=photo, bg="white")  # Create label for image
-        label.image = photo  # Keep a reference to avoid garbage collection
-        label.pack(expand=True)  # Pack label into the window
-    except:
-        label = tk.Label(splash, text=NOMBRE_MARCA, font=("Segoe UI", 16), bg="white", fg="#2196F3")  # Fallback label
-        label.pack(expand=True)  # Pack fallback label
+        yield
+    finally:
+        STARTUP_TIMES.append((name, start - _startup_t0, time.perf_counter() - _startup_t0))
+
+# Prints the startup phases in the style of python -X importtime
+def print_startup_report(out=None):
+    out = out or sys.stderr
+    print("startup:  self [ms] | at end [ms] | phase", file=out)
+    for name, start, end in sorted(STARTUP_TIMES, key=lambda phase: phase[2]):
+        print(f"startup: {(end - start) * 1000:9.1f} | {end * 1000:11.1f} | {name}", file=out)
 
-    def close_splash():
-        splash.destroy()  # Close splash window
-        start_main_window()  # Start the main application window
+# Starts slow work in the background while the splash is shown; report is set when the main window is up
+def prewarm(main_ready=None):
+    def work():
+        with startup_phase("prewarm: snapshot cache"):
+            cache = get_snapshot_cache()
+            with cache.lock:
+                if cache.entries is None:
+                    cache.load()
+        if USE_SESSION_POOL and isinstance(get_collector(), PowerShellCollector):
+            with startup_phase("prewarm: PowerShell worker"):
+                get_session_pool().warm()  # Pays PowerShell's cold start before the first click
+        with startup_phase("prewarm: fpdf import"):
+            try:
+                import fpdf  # Ready by the time the first sheet is saved
+            except ImportError:
+                pass
+        if REPORT_STARTUP and main_ready is not None:
+            main_ready.wait()
+            print_startup_report()
+
+    thread = threading.Thread(target=work, daemon=True)
+    thread.start()
+    return thread
+
+# Returns the splash image. The resized copy is cached so later starts load it with Tk alone, without PIL.
+def splash_photo(master, width, height):
+    source = resource_path(IMAGEN_SPLASH)  # Get splash image path
+    cached = os.path.join(cache_dir(), f"splash_{width}x{height}_{os.path.getsize(source)}.png")
+    try:
+        return tk.PhotoImage(master=master, file=cached)
+    except tk.TclError:
+        pass
+    from PIL import Image, ImageTk  # Only needed until the resized image is cached
+    image = Image.open(source)  # Open image
+    image = image.resize((width, height), Image.LANCZOS)  # Resize image
+    try:
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        image.save(cached)
+    except OSError:
+        pass  # Resized again on the next start
+    return ImageTk.PhotoImage(image, master=master)  # Create PhotoImage object
 
-    splash.after(2000, close_splash)  # Close splash after 2 seconds
-    splash.mainloop()  # Run the splash window event loop
+# Shows a splash window while the main window is built on the same Tk root, then runs the app
+def splash_window():
+    with startup_phase("tk root"):
+        window = tk.Tk()  # Single Tk root; the main window is built on it behind the splash
+        window.withdraw()
+    with startup_phase("splash shown"):
+        splash = tk.Toplevel(window)  # Create the splash window
+        splash.overrideredirect(True)  # Remove window decorations
+        splash.configure(bg="white")  # Set background color
+        splash_width, splash_height = 200, 200  # Set splash window size
+        screen_width = splash.winfo_screenwidth()  # Get screen width
+        screen_height = splash.winfo_screenheight()  # Get screen height
+        x = (screen_width // 2) - (splash_width // 2)  # Calculate x position
+        y = (screen_height // 2) - (splash_height // 2)  # Calculate y position
+        splash.geometry(f"{splash_width}x{splash_height}+{x}+{y}")  # Set window size and position
+        try:
+            photo = splash_photo(splash, splash_width, splash_height)
+            label = tk.Label(splash, image=photo, bg="white")  # Create label for image
+            label.image = photo  # Keep a reference to avoid garbage collection
+            label.pack(expand=True)  # Pack label into the window
+        except Exception:
+            label = tk.Label(splash, text=NOMBRE_MARCA, font=("Segoe UI", 16), bg="white", fg="#2196F3")  # Fallback label
+            label.pack(expand=True)  # Pack fallback label
+        splash.update()  # Paint the splash now
+    main_ready = threading.Event()
+    prewarm(main_ready)  # Runs while the main window is being built
+    with startup_phase("main window built"):
+        start_main_window(window)
+    with startup_phase("main window shown"):
+        window.deiconify()
+        window.update_idletasks()
+        splash.destroy()  # Close the splash as soon as the main window is ready
+    main_ready.set()
+    window.mainloop()  # Run the main window event loop
 
-# Starts the main application window
-def start_main_window():
-    global header, btn_obtain, btn_language
-    window = tk.Tk()  # Create a new Tkinter window
+# Builds the main application window on the given Tk root
+def start_main_window(window):
+    global header, btn_obtain, btn_language, btn_cancel, btn_save, text_area
     window.resizable(False, False)  # Disable resizing
     window.title(NOMBRE_MARCA)  # Set window title
     center_window(window, 400, 200)  # Center the window
@@ -333,27 +1644,90 @@ def start_main_window():
     text_area.grid(row=2, column=0, padx=20, pady=(5, 10), sticky="nsew")  # Place text area in grid
     text_area.grid_remove()  # Initially hide text area
 
-    progress = ttk.Progressbar(window, mode='indeterminate')  # Create progress bar
+    progress = ttk.Progressbar(window, mode='determinate')  # Create progress bar (probes done of total)
     progress.grid(row=3, column=0, padx=20, pady=5, sticky='ew')  # Place progress bar in grid
     progress.grid_remove()  # Initially hide progress bar
 
-    def task_get_sheet():
+    running = [None]  # State of the running collection
+    btn_cancel = tk.Button(window, text=traducciones[idioma_actual]["cancelar"], command=lambda: running[0] and running[0]["cancel"].cancel(),
+                           bg=background_color, fg=main_color, font=general_font, bd=0, cursor="hand2")  # Create cancel button
+    btn_cancel.grid(row=4, column=0, padx=20, pady=(0, 5))  # Place cancel button in grid
+    btn_cancel.grid_remove()  # Initially hide cancel button
+
+    def button_save():
+        file = ask_pdf_file(current_snapshot)
+        if file:
+            save_pdf_sheet(current_snapshot, file)  # In the current language, without collecting again
+
+    btn_save = tk.Button(window, text=traducciones[idioma_actual]["guardar_pdf"], command=button_save,
+                         bg=background_color, fg=main_color, font=general_font, bd=0, cursor="hand2")  # Create save button
+    btn_save.grid(row=4, column=0, padx=20, pady=(0, 5))  # Same place as the cancel button; they are never shown together
+    btn_save.grid_remove()  # Shown once there is a sheet
+
+    def task_get_sheet(state):
         try:
-            data = get_pc_data()  # Get PC data
-            sheet = format_sheet(data)  # Format the data into a sheet
-            window.after(0, show_sheet_and_save, data, sheet, window, text_area)  # Show and save the sheet
+            for key, value in iter_pc_data(cancel=state["cancel"], cache=get_snapshot_cache(),
+                                           progress=lambda done, total: state["queue"].put(("progress", done, total))):
+                state["queue"].put(("field", key, value))  # Handed to the Tk thread, which batches updates
         finally:
-            window.after(0, lambda: btn_obtain.config(state=tk.NORMAL))  # Enable button after task
-            window.after(0, lambda: progress.stop())  # Stop progress bar
-            window.after(0, lambda: progress.grid_remove())  # Hide progress bar
+            state["queue"].put(("done", None, None))
+
+    def finish_collection(state):
+        global current_snapshot
+        btn_obtain.config(state=tk.NORMAL)  # Enable button after task
+        progress.grid_remove()  # Hide progress bar
+        btn_cancel.grid_remove()  # Hide cancel button
+        stats = get_snapshot_cache().stats()
+        print(f"Snapshot cache: {stats['hits']} hits, {stats['misses']} misses")  # Debug message, totals since start
+        if not state["data"]:
+            return
+        current_snapshot = Snapshot(state["data"])  # Frozen; language changes re-render it from the cache
+        show_sheet(text_area, render_sheet(current_snapshot))
+        btn_save.grid()
+        if not state["cancel"].cancelled() and state["file"]:
+            save_pdf_sheet(current_snapshot, state["file"])  # Save once every probe is in
+
+    def poll_collection(state):
+        changed = False
+        while True:  # Apply everything that arrived since the last tick in one update
+            try:
+                kind, first, second = state["queue"].get_nowait()
+            except queue.Empty:
+                break
+            if kind == "field":
+                state["data"][first] = second
+                changed = True
+            elif kind == "progress":
+                progress.config(maximum=second, value=first)  # N of M probes
+            else:
+                state["done"] = True
+        if changed or state["lang"] != idioma_actual:
+            state["lang"] = idioma_actual
+            show_sheet(text_area, format_sheet(sheet_order(state["data"])))  # Partial sheets are not cached
+        ready = has_required_fields(state["data"])
+        if state["done"] and not state["dialog_open"] and (state["asked"] or state["cancel"].cancelled() or not ready):
+            finish_collection(state)  # Without the required fields there is nothing to save under a name
+            return
+        window.after(UI_REFRESH_MS, poll_collection, state)  # Keep polling, also while the save dialog is open
+        if not state["asked"] and not state["cancel"].cancelled() and ready:
+            state["asked"] = state["dialog_open"] = True
+            state["file"] = ask_pdf_file(state["data"])  # The remaining probes keep arriving meanwhile
+            state["dialog_open"] = False
 
     def button_get():
+        global current_snapshot
+        current_snapshot = None  # The sheet on screen is being replaced
         btn_obtain.config(state=tk.DISABLED)  # Disable button during task
-        text_area.grid_remove()  # Hide text area
+        btn_save.grid_remove()  # Hide save button
+        center_window(window, 700, 600)  # Make room for the sheet
+        text_area.grid()  # Show the text area; fields appear as they arrive
         text_area.delete(1.0, tk.END)  # Clear text area
+        progress.config(value=0, maximum=len(PS_PROBES))
         progress.grid()  # Show progress bar
-        progress.start()  # Start progress bar animation
-        threading.Thread(target=task_get_sheet, daemon=True).start()  # Start task in a new thread
+        btn_cancel.grid()  # Show cancel button
+        state = running[0] = dict(cancel=CancelToken(), queue=queue.Queue(), data={}, done=False, asked=False, dialog_open=False, file="", lang=idioma_actual)  # New collection
+        threading.Thread(target=task_get_sheet, args=(state,), daemon=True).start()  # Start task in a new thread
+        window.after(UI_REFRESH_MS, poll_collection, state)
 
     btn_obtain = ttk.Button(window, text=traducciones[idioma_actual]["obtener_ficha"],
                              command=button_get, style="Custom.TButton")  # Create button to get sheet
@@ -361,7 +1735,1073 @@ def start_main_window():
 
     window.grid_columnconfigure(0, weight=1)  # Configure column weight
     window.grid_rowconfigure(2, weight=1)  # Configure row weight
-    window.mainloop()  # Run the main window event loop
+
+# Converts sheet data to a JSON-serializable snapshot
+def snapshot_to_json(data):
+    return {k: [list(d) for d in v] if k == "Disks" and isinstance(v, (list, tuple)) else v for k, v in data.items()}
+
+# Converts a JSON snapshot back to sheet data, ignoring unknown keys
+def snapshot_from_json(obj):
+    if not isinstance(obj, dict):
+        raise ValueError("snapshot must be a JSON object")
+    if obj.get("Error"):
+        raise ValueError(f"collection failed: {obj['Error']}")  # Fleet record of a host that could not be collected
+    data = {}
+    for key in FIELD_ORDER:
+        value = obj.get(key)
+        if key == "Disks" and isinstance(value, list):
+            value = [tuple(str(part) for part in d) for d in value]  # Disks are (device, free, size) tuples
+        if value:
+            data[key] = value
+    return data
+
+# Yields (name, record, error) for every JSON record in the given files, directories (*.json, *.ndjson) or "-" for NDJSON on stdin
+def iter_records(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            files = [os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith((".json", ".ndjson", ".jsonl"))]
+            yield from iter_records(files)
+            continue
+        stem = "stdin" if path == "-" else os.path.splitext(os.path.basename(path))[0]
+        try:
+            source = contextlib.nullcontext(sys.stdin) if path == "-" else open(path, encoding="utf-8")  # Never close stdin
+        except OSError as e:
+            yield stem, None, str(e)
+            continue
+        with source as f:
+            if path == "-" or path.endswith((".ndjson", ".jsonl")):
+                for number, line in enumerate(f, 1):  # Stream one record at a time
+                    if line.strip():
+                        name = f"{stem}_{number}"
+                        try:
+                            record = json.loads(line)
+                        except ValueError as e:
+                            yield name, None, str(e)
+                            continue
+                        yield name, record, None
+            else:
+                try:
+                    obj = json.load(f)
+                except ValueError as e:
+                    yield stem, None, str(e)
+                    continue
+                records = obj if isinstance(obj, list) else [obj]  # A .json file may hold one snapshot or a list
+                for number, record in enumerate(records, 1):
+                    yield (stem if len(records) == 1 else f"{stem}_{number}"), record, None
+
+# Yields (name, data, error) for every snapshot in the given files, directories (*.json, *.ndjson) or "-" for NDJSON on stdin
+def iter_snapshots(paths):
+    for name, record, error in iter_records(paths):
+        if error:
+            yield name, None, error
+            continue
+        try:
+            yield name, snapshot_from_json(record), None
+        except ValueError as e:
+            yield name, None, str(e)
+
+# Host name of a snapshot: its Computer Name, or None when the probe failed or timed out
+def snapshot_host(data):
+    name = data.get("Computer Name")
+    return name if name and name != UNAVAILABLE else None
+
+# Flattens sheet data to text fields; each disk becomes "Disk <device> Free (GB)" and "Disk <device> Size (GB)"
+def flatten_snapshot(data):
+    flat = {}
+    for key, value in data.items():
+        if key == "Disks" and isinstance(value, (list, tuple)):
+            for device, free, size in value:
+                flat[f"Disk {device} Free (GB)"] = str(free)
+                flat[f"Disk {device} Size (GB)"] = str(size)
+        else:
+            flat[key] = str(value)
+    return flat
+
+DISK_FIELD = re.compile(r"^Disk (.+) (Free|Size) \(GB\)$")  # Flattened disk fields
+
+# Rebuilds sheet data from flattened fields
+def unflatten_snapshot(flat):
+    data, disks = {}, {}
+    for key, value in flat.items():
+        match = DISK_FIELD.match(key)
+        if match:
+            disks.setdefault(match.group(1), {})[match.group(2)] = value
+        else:
+            data[key] = value
+    if disks:
+        data["Disks"] = [(device, parts.get("Free", ""), parts.get("Size", "")) for device, parts in sorted(disks.items())]
+    return sheet_order(data)
+
+# Returns the per-user data directory of the application
+def data_dir():
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, NOMBRE_MARCA)
+
+# Converts a datetime, an ISO 8601 string or a number to Unix seconds; None is now
+def _timestamp(when):
+    if when is None:
+        return int(time.time())
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    if isinstance(when, datetime):
+        return int(when.timestamp())
+    return int(when)
+
+# Formats Unix seconds as local date and time
+def _iso(stamp):
+    return datetime.fromtimestamp(stamp).isoformat(sep=" ", timespec="seconds")
+
+# Append-only history of sheets in SQLite. Every field value is stored once (vals); a snapshot records only
+# the fields that changed since the host's previous snapshot (changes). "current" holds the latest value of
+# every field so queries on the present state need no replay. Changes are keyed by host, field and time and
+# carry the numeric value, indexed by field, so threshold queries read only the matching rows.
+class HistoryStore:
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS hosts (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, last_time INTEGER);
+    CREATE TABLE IF NOT EXISTS fields (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+    CREATE TABLE IF NOT EXISTS vals (id INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE, num REAL);
+    CREATE TABLE IF NOT EXISTS snapshots (id INTEGER PRIMARY KEY, host_id INTEGER NOT NULL, time INTEGER NOT NULL);
+    CREATE INDEX IF NOT EXISTS snapshots_host_time ON snapshots (host_id, time);
+    CREATE INDEX IF NOT EXISTS snapshots_time ON snapshots (time);
+    CREATE TABLE IF NOT EXISTS changes (host_id INTEGER NOT NULL, field_id INTEGER NOT NULL, time INTEGER NOT NULL,
+                                        value_id INTEGER, num REAL, PRIMARY KEY (host_id, field_id, time)) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS changes_field_num ON changes (field_id, num, time);
+    CREATE TABLE IF NOT EXISTS current (host_id INTEGER NOT NULL, field_id INTEGER NOT NULL, value_id INTEGER NOT NULL,
+                                        time INTEGER NOT NULL, PRIMARY KEY (host_id, field_id)) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS current_field ON current (field_id, value_id);
+    """
+    INTERN_LIMIT = 100000  # Interned ids remembered in memory before the lookup cache is reset
+
+    def __init__(self, path=None):
+        import sqlite3
+        self.path = path or os.path.join(data_dir(), "history.sqlite")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")  # Readers are not blocked while a fleet is being imported
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(self.SCHEMA)
+        self.ids = {"hosts": {}, "fields": {}, "vals": {}}  # text -> id; vals -> (id, number)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _intern(self, table, text):
+        cache = self.ids[table]
+        found = cache.get(text)
+        if found is not None:
+            return found
+        if table == "vals":
+            row = self.db.execute("SELECT id, num FROM vals WHERE value = ?", (text,)).fetchone()
+            if row is None:
+                try:
+                    num = float(text)
+                except ValueError:
+                    num = None  # Only numeric values take part in threshold queries
+                row = (self.db.execute("INSERT INTO vals (value, num) VALUES (?, ?)", (text, num)).lastrowid, num)
+        else:
+            row = self.db.execute(f"SELECT id FROM {table} WHERE name = ?", (text,)).fetchone()
+            if row is None:
+                row = (self.db.execute(f"INSERT INTO {table} (name) VALUES (?)", (text,)).lastrowid,)
+            row = row[0]
+        if len(cache) >= self.INTERN_LIMIT:
+            cache.clear()  # Keeps memory flat on very large imports
+        cache[text] = row
+        return row
+
+    def _field_ids(self, pattern):
+        return [row[0] for row in self.db.execute("SELECT id FROM fields WHERE name LIKE ?", (pattern,))]
+
+    def _add(self, host, data, when):
+        stamp = _timestamp(when)
+        host_id = self._intern("hosts", host)
+        last = self.db.execute("SELECT last_time FROM hosts WHERE id = ?", (host_id,)).fetchone()[0]
+        if last is not None and stamp < last:
+            if self.db.execute("SELECT 1 FROM snapshots WHERE host_id = ? AND time = ?", (host_id, stamp)).fetchone():
+                return None  # Already imported (e.g. the same file added twice)
+            raise ValueError(f"{host}: snapshot at {stamp} is older than the last one ({last})")
+        previous = dict(self.db.execute("SELECT field_id, value_id FROM current WHERE host_id = ?", (host_id,)))
+        fields, unknown = {}, set()
+        for key, value in flatten_snapshot(data).items():
+            field_id = self._intern("fields", key)
+            if value == UNAVAILABLE:
+                unknown.add(field_id)  # A probe that timed out says nothing about the field
+            else:
+                fields[field_id] = self._intern("vals", value)
+        if data.get("Disks") == UNAVAILABLE:  # Disks are stored as per-disk fields: keep all of them
+            unknown.update(field_id for field_id, name in self.db.execute(
+                "SELECT f.id, f.name FROM current c JOIN fields f ON f.id = c.field_id WHERE c.host_id = ?", (host_id,))
+                if DISK_FIELD.match(name))
+        changed = [(host_id, field_id, stamp, value_id, num) for field_id, (value_id, num) in fields.items()
+                   if previous.get(field_id) != value_id]
+        removed = [field_id for field_id in previous if field_id not in fields and field_id not in unknown]
+        changed += [(host_id, field_id, stamp, None, None) for field_id in removed]
+        if stamp == last and not changed:
+            return None  # The same snapshot imported again
+        snapshot_id = self.db.execute("INSERT INTO snapshots (host_id, time) VALUES (?, ?)", (host_id, stamp)).lastrowid
+        self.db.executemany("INSERT OR REPLACE INTO changes (host_id, field_id, time, value_id, num) VALUES (?, ?, ?, ?, ?)", changed)
+        self.db.executemany("INSERT OR REPLACE INTO current (host_id, field_id, value_id, time) VALUES (?, ?, ?, ?)",
+                            [(host_id, field_id, value_id, stamp) for _, field_id, _, value_id, _ in changed if value_id is not None])
+        self.db.executemany("DELETE FROM current WHERE host_id = ? AND field_id = ?", [(host_id, field_id) for field_id in removed])
+        self.db.execute("UPDATE hosts SET last_time = ? WHERE id = ?", (stamp, host_id))
+        return snapshot_id
+
+    # Stores one snapshot of host taken at when (default now); returns its id, or None if it repeats the last one
+    def append(self, host, data, when=None):
+        with self.db:
+            return self._add(host, data, when)
+
+    # Stores many (host, data, when) snapshots in one transaction. Snapshots older than their host's last one
+    # are skipped, and snapshots already stored are not counted; returns (stored count, [(host, error)])
+    def append_many(self, snapshots):
+        count, failures = 0, []
+        with self.db:
+            for host, data, when in snapshots:
+                try:
+                    if self._add(host, data, when) is not None:
+                        count += 1
+                except ValueError as e:
+                    failures.append((host, str(e)))
+        return count, failures
+
+    def hosts(self):
+        return [row[0] for row in self.db.execute("SELECT name FROM hosts ORDER BY name")]
+
+    # Sheet data of host as of when (default: latest)
+    def snapshot_at(self, host, when=None):
+        rows = self.db.execute("""
+            SELECT f.name, v.value FROM changes c JOIN fields f ON f.id = c.field_id JOIN vals v ON v.id = c.value_id
+            WHERE c.host_id = (SELECT id FROM hosts WHERE name = ?) AND c.time = (
+                SELECT MAX(time) FROM changes WHERE host_id = c.host_id AND field_id = c.field_id AND time <= ?)""",
+            (host, _timestamp(when)))
+        return unflatten_snapshot(dict(rows))
+
+    # (time, value) of every change of a field of host, oldest first; numeric fields give floats
+    def history(self, host, field, since=None, until=None):
+        rows = self.db.execute("""
+            SELECT c.time, v.value, v.num FROM changes c LEFT JOIN vals v ON v.id = c.value_id
+            WHERE c.host_id = (SELECT id FROM hosts WHERE name = ?) AND c.field_id = (SELECT id FROM fields WHERE name = ?)
+              AND c.time BETWEEN ? AND ? ORDER BY c.time""",
+            (host, field, _timestamp(since or 0), _timestamp(until)))
+        return [(stamp, num if num is not None else value) for stamp, value, num in rows]
+
+    # (host, field, value, since) of the hosts whose latest value of the field(s) is below threshold.
+    # field is a LIKE pattern, so "Disk % Free (GB)" covers every drive.
+    def below(self, field, threshold):
+        ids = self._field_ids(field)
+        if not ids:
+            return []
+        marks = ",".join("?" * len(ids))
+        return self.db.execute(f"""
+            SELECT h.name, f.name, v.num, c.time FROM current c JOIN vals v ON v.id = c.value_id
+            JOIN hosts h ON h.id = c.host_id JOIN fields f ON f.id = c.field_id
+            WHERE c.field_id IN ({marks}) AND v.num < ? ORDER BY v.num""", (*ids, threshold)).fetchall()
+
+    # (host, field, time, before, after) of every change that took the field(s) from threshold or above to below it
+    def dropped_below(self, field, threshold, since=None):
+        ids = self._field_ids(field)
+        if not ids:
+            return []
+        marks = ",".join("?" * len(ids))
+        return self.db.execute(f"""
+            SELECT h.name, f.name, t.time, t.before, t.after FROM (
+                SELECT c.host_id, c.field_id, c.time, c.num AS after,
+                       (SELECT p.num FROM changes p  -- Previous value, through the primary key
+                        WHERE p.host_id = c.host_id AND p.field_id = c.field_id AND p.time < c.time
+                        ORDER BY p.time DESC LIMIT 1) AS before
+                FROM changes c WHERE c.field_id IN ({marks}) AND c.num < ? AND c.time >= ?) t
+            JOIN hosts h ON h.id = t.host_id JOIN fields f ON f.id = t.field_id
+            WHERE t.before >= ? ORDER BY t.time""",
+            (*ids, threshold, _timestamp(since or 0), threshold)).fetchall()
+
+    # Yields (host, data, when) from fleet or collect records; the host is "Host" or else the computer name
+    @staticmethod
+    def records_to_snapshots(records, failures=None):
+        for name, record, error in records:
+            try:
+                if error:
+                    raise ValueError(error)
+                data = snapshot_from_json(record)
+                host = record.get("Host") or snapshot_host(data)
+                if not host:
+                    raise ValueError("record has no Host or Computer Name")
+            except ValueError as e:
+                if failures is not None:
+                    failures.append((name, str(e)))
+                continue
+            yield host, data, record.get("Collected")
+
+    # Yields (host, data, time of the last snapshot) with the latest sheet of every host, one host at a time
+    def iter_latest(self):
+        rows = self.db.execute("""
+            SELECT h.name, h.last_time, f.name, v.value FROM current c JOIN hosts h ON h.id = c.host_id
+            JOIN fields f ON f.id = c.field_id JOIN vals v ON v.id = c.value_id ORDER BY c.host_id""")
+        host, flat, collected = None, {}, None
+        for name, last_time, field, value in rows:
+            if name != host:
+                if host is not None:
+                    yield host, unflatten_snapshot(flat), collected
+                host, flat, collected = name, {}, last_time  # Collected even if nothing changed since
+            flat[field] = value
+        if host is not None:
+            yield host, unflatten_snapshot(flat), collected
+
+    # Number of hosts, snapshots, stored changes, distinct values and the database size in bytes
+    def stats(self):
+        count = lambda table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        size = self.db.execute("SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()").fetchone()[0]
+        return {"hosts": count("hosts"), "snapshots": count("snapshots"), "changes": count("changes"), "values": count("vals"), "bytes": size}
+
+# Columns of every export, in order. Disks are flattened into numbered slots so the schema never changes.
+EXPORT_FIELDS = tuple(key for key in FIELD_ORDER if key != "Disks")
+EXPORT_COLUMNS = (("Host", "Collected") + EXPORT_FIELDS
+                  + tuple(f"Disk {slot} {part}" for slot in range(1, EXPORT_DISK_SLOTS + 1) for part in ("Device", "Free (GB)", "Size (GB)"))
+                  + ("Other Disks",))
+
+# Flattens one snapshot into a list of text values aligned with EXPORT_COLUMNS ("" when missing)
+def export_row(data, host="", collected=""):
+    row = [host or "", collected or ""]
+    row.extend(map(str, map(data.get, EXPORT_FIELDS, itertools.repeat(""))))
+    disks = data.get("Disks") or ()
+    other = ""
+    if not isinstance(disks, (list, tuple)):
+        disks, other = (), str(disks)  # Disk probe unavailable
+    for slot in range(EXPORT_DISK_SLOTS):
+        row += [str(part) for part in disks[slot]] if slot < len(disks) else ["", "", ""]
+    row.append("; ".join(f"{device}={free}/{size}" for device, free, size in disks[EXPORT_DISK_SLOTS:]) or other)
+    return row
+
+# Yields export rows for the records in the given files (collect or fleet output); records that cannot be
+# read or hold a failed collection are added to failures as (name, error)
+def iter_export_rows(paths, failures=None):
+    for name, record, error in iter_records(paths):
+        try:
+            if error:
+                raise ValueError(error)
+            data = snapshot_from_json(record)
+        except ValueError as e:
+            if failures is not None:
+                failures.append((name, str(e)))
+            continue
+        yield export_row(data, record.get("Host"), record.get("Collected"))
+
+_EXPORT_KEYS = [json.encoder.encode_basestring(column) + ": " for column in EXPORT_COLUMNS]  # Encoded once
+
+# Encodes a row as a JSON object without the empty columns. Every value is text, so the object is joined
+# from pre-encoded keys, about twice as fast as json.dumps() on a dict.
+def export_json(row):
+    encode = json.encoder.encode_basestring
+    return "{" + ", ".join([key + encode(value) for key, value in zip(_EXPORT_KEYS, row) if value]) + "}"
+
+# Writes rows as NDJSON, one object per line; returns the number of rows
+def write_ndjson(rows, f):
+    count = 0
+    for row in rows:
+        f.write(export_json(row) + "\n")
+        count += 1
+    return count
+
+# Writes rows as CSV with a header row and every column, in EXPORT_COLUMNS order; returns the number of rows
+def write_csv(rows, f):
+    writer = csv.writer(f, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    count = itertools.count()
+    writer.writerows(row for row, _ in zip(rows, count))  # The C writer loops; count tracks the rows
+    return next(count)
+
+# Writes rows as one JSON array, an element at a time; returns the number of rows
+def write_json_array(rows, f):
+    f.write("[")
+    count = 0
+    for row in rows:
+        f.write((",\n" if count else "\n") + export_json(row))
+        count += 1
+    f.write("\n]\n" if count else "]\n")
+    return count
+
+# Export formats: format -> writer(rows, file)
+EXPORTERS = {"ndjson": write_ndjson, "csv": write_csv, "json": write_json_array}
+
+# Streams rows to output ("-" is stdout) in the given format; returns the number of rows written, or None
+# if the reader closed stdout early (export ... | head)
+def export_rows(rows, fmt, output="-"):
+    if output == "-":
+        try:
+            count = EXPORTERS[fmt](rows, sys.stdout)
+            sys.stdout.flush()
+            return count
+        except BrokenPipeError:
+            with contextlib.suppress(AttributeError, OSError, ValueError):  # Not a real file (tests, IDEs)
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())  # Python flushes stdout again at exit
+            return None
+    with open(output, "w", encoding="utf-8", newline="") as f:
+        return EXPORTERS[fmt](rows, f)
+
+# Renders a chunk of snapshots in a worker process; returns (name, error) for each one
+def render_chunk(chunk, out_dir, formats, lang, timings=False):
+    if timings:
+        enable_timings()  # Fresh recorder in this process; its records go back with the results
+    results = []
+    for name, file_name, data in chunk:
+        try:
+            base = os.path.join(out_dir, file_name)
+            if "txt" in formats:
+                with open(base + ".txt", "w", encoding="utf-8") as f:
+                    f.write(format_sheet(data, lang))
+            if "pdf" in formats:
+                create_pdf_sheet(data, base + ".pdf", lang)
+            results.append((name, None))
+        except Exception as e:
+            results.append((name, f"{type(e).__name__}: {e}"))
+    return results, disable_timings().records if timings else []
+
+# Picks the file name of a rendered sheet: the computer name (or the record name when it is missing),
+# with a numeric suffix when an earlier sheet of this run already took it
+def sheet_file_name(name, data, used):
+    computer = data.get("Computer Name")
+    base = re.sub(r"[^\w.-]+", "_", computer if computer and computer != UNAVAILABLE else name).strip("._") or "sheet"
+    file_name, number = base, 1
+    while file_name.casefold() in used:  # Case-insensitive, like the file system on Windows
+        number += 1
+        file_name = f"{base}_{number}"
+    used.add(file_name.casefold())
+    return file_name
+
+# Renders many snapshots on a process pool; returns the list of (name, error) failures.
+# combined and table are optional files for one multi-page PDF and one consolidated table, filled in the same pass.
+def render_snapshots(paths, out_dir, formats=("pdf", "txt"), lang=None, workers=None, chunk_size=16, progress=None,
+                     combined=None, table=None):
+    lang = lang or idioma_actual
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(out_dir, exist_ok=True)
+    failures, done, used = [], 0, set()
+    documents = [(SheetDocument(get_sheet_renderer(lang), kind), file) for kind, file in (("pages", combined), ("table", table)) if file]
+
+    def chunks():
+        chunk = []
+        for name, data, error in iter_snapshots(paths):
+            if error:
+                failures.append((name, error))  # Unreadable records are reported, not rendered
+                continue
+            chunk.append((name, sheet_file_name(name, data, used), data))
+            for document, _ in documents:  # Inputs are read once, so stdin works too
+                try:
+                    document.add(data)
+                except Exception as e:
+                    failures.append((name, f"{type(e).__name__}: {e}"))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def collect(chunk_result):
+        nonlocal done
+        results, records = chunk_result
+        if parent_timings is not None:
+            with parent_timings.lock:
+                parent_timings.records.extend(records)
+        done += len(results)
+        failures.extend(r for r in results if r[1])
+        if progress:
+            progress(done, len(failures))
+
+    parent_timings = _timings
+    if workers == 1:
+        for chunk in chunks():
+            collect(render_chunk(chunk, out_dir, formats, lang))  # Records go straight to the active Timings
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            running = set()
+            for chunk in chunks():  # Keep only a few chunks in flight so memory stays flat
+                running.add(executor.submit(render_chunk, chunk, out_dir, formats, lang, parent_timings is not None))
+                if len(running) >= workers * 2:
+                    finished, running = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in finished:
+                        collect(future.result())
+            for future in concurrent.futures.as_completed(running):
+                collect(future.result())
+    for document, file in documents:
+        document.finish(file)
+    return failures
+
+# Prints render progress on one line of stderr
+def print_progress(done, failed):
+    print(f"\rRendered {done} sheet(s), {failed} failed", end="", file=sys.stderr, flush=True)
+
+# Remote execution used by the fleet collector: run(host, script, timeout) runs a PowerShell script on
+# the host and returns its stdout, or raises TransportError
+class Transport:
+    name = "base"
+
+    async def run(self, host, script, timeout=None):
+        raise NotImplementedError
+
+# Runs the script through a local command such as ssh. {host} and {encoded} (the script for
+# -EncodedCommand) are replaced in each argument.
+class CommandTransport(Transport):
+    def __init__(self, argv, name="command"):
+        self.argv = list(argv)
+        self.name = name
+
+    async def run(self, host, script, timeout=None):
+        import asyncio
+        encoded = base64.b64encode(script.encode('utf-16-le')).decode('ascii')
+        argv = [part.format(host=host, encoded=encoded) for part in self.argv]
+        process = await asyncio.create_subprocess_exec(*argv, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                                       stderr=subprocess.PIPE, creationflags=CREATE_NO_WINDOW)
+        try:
+            stdout, stderr = await process.communicate()
+        except BaseException:  # Timed out or cancelled: do not leave the remote command running
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        if process.returncode:
+            lines = stderr.decode("utf-8", "replace").strip().splitlines()
+            raise TransportError(lines[-1] if lines else f"exit status {process.returncode}")
+        return stdout.decode("utf-8", "replace")
+
+# Command lines of the built-in transports. winrm runs from a Windows machine with PowerShell remoting
+# enabled on the targets; ssh needs key-based login to an OpenSSH server on each target.
+FLEET_TRANSPORTS = {
+    "winrm": ["powershell", "-NoProfile", "-NonInteractive", "-Command",
+              "[Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false; "  # The output is decoded as UTF-8, not the OEM code page
+              "Invoke-Command -ComputerName '{host}' -ErrorAction Stop -ScriptBlock ([scriptblock]::Create("
+              "[Text.Encoding]::Unicode.GetString([Convert]::FromBase64String('{encoded}'))))"],
+    "ssh": ["ssh", "-o", "BatchMode=yes", "-o", "ConnectTimeout=15", "{host}",
+            "powershell", "-NoProfile", "-NonInteractive", "-EncodedCommand", "{encoded}"],
+}
+
+# Returns the transport with the given name: winrm, ssh or simulated
+def get_transport(name):
+    if name == "simulated":
+        return SimulatedTransport()
+    return CommandTransport(FLEET_TRANSPORTS[name], name)
+
+# Yields host names from the arguments; @FILE reads one host per line (@- reads stdin), skipping blanks and # comments
+def iter_hosts(args):
+    for arg in args:
+        if not arg.startswith("@"):
+            yield arg
+            continue
+        source = contextlib.nullcontext(sys.stdin) if arg == "@-" else open(arg[1:], encoding="utf-8")  # Never close stdin
+        with source as f:
+            for line in f:  # Read lazily: the host list can be larger than memory allows
+                host = line.split("#", 1)[0].strip()
+                if host:
+                    yield host
+
+# Collects one host: every probe in one round trip, retried with jittered exponential backoff.
+# Returns (data, attempts, error); data is None when every attempt failed.
+async def collect_host(host, transport, script, timeout=FLEET_TIMEOUT, retries=FLEET_RETRIES, backoff=FLEET_BACKOFF):
+    import asyncio, random
+    if not FLEET_HOST_PATTERN.fullmatch(host):
+        return None, 0, "invalid host name"  # Host names end up in command lines: never run them
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+        try:
+            output = await asyncio.wait_for(transport.run(host, script, timeout), timeout)
+        except asyncio.TimeoutError:
+            error = f"timed out after {timeout} s"
+            continue
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            continue
+        raw = parse_probe_output(output)
+        if raw:
+            return build_pc_data(raw), attempt + 1, None
+        error = "no probe output"
+    return None, retries + 1, error
+
+# Collects many hosts through a transport and writes one NDJSON line per host as soon as it finishes
+# ("-" writes to stdout). At most `concurrency` hosts run at once and hosts is consumed lazily,
+# so memory stays flat however long the host list is. Failed hosts get a line with an "Error" field.
+async def collect_fleet(hosts, transport, output, concurrency=FLEET_CONCURRENCY, timeout=FLEET_TIMEOUT,
+                        retries=FLEET_RETRIES, backoff=FLEET_BACKOFF, append=False, progress=None):
+    import asyncio
+    script = build_probe_script()  # Same script for every host
+    hosts = iter(hosts)  # Shared by the workers: each takes the next host when it is free
+    counts = {"ok": 0, "failed": 0}
+    started = time.monotonic()
+
+    async def worker(f):
+        for host in hosts:
+            data, attempts, error = await collect_host(host, transport, script, timeout, retries, backoff)
+            record = {"Host": host, "Collected": datetime.now().isoformat(timespec="seconds"), "Attempts": attempts}
+            if error:
+                record["Error"] = error
+                counts["failed"] += 1
+            else:
+                record.update(snapshot_to_json(data))
+                counts["ok"] += 1
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")  # Streamed; nothing is kept per host
+            if progress:
+                progress(counts["ok"] + counts["failed"], counts["failed"])
+
+    if output == "-":
+        f = contextlib.nullcontext(sys.stdout)
+    else:
+        f = open(output, "a" if append else "w", encoding="utf-8", buffering=1)  # Line buffered
+    with f as stream:
+        await asyncio.gather(*(worker(stream) for _ in range(max(1, concurrency))))
+    elapsed = time.monotonic() - started
+    done = counts["ok"] + counts["failed"]
+    return dict(counts, hosts=done, elapsed=elapsed, hosts_per_s=done / elapsed if elapsed else 0.0)
+
+# Synchronous wrapper of collect_fleet()
+def run_fleet(hosts, transport, output, **options):
+    import asyncio
+    return asyncio.run(collect_fleet(hosts, transport, output, **options))
+
+# Prints fleet progress on one line of stderr
+def print_fleet_progress(done, failed):
+    print(f"\rCollected {done} host(s), {failed} failed", end="", file=sys.stderr, flush=True)
+
+# Synthetic but realistic sheet data for benchmarks; index varies the per-machine fields
+def sample_pc_data(index=0):
+    return {
+        "Computer Name": f"PC-{index:06d}", "IPv4 Address(es)": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}",
+        "Connected Network (SSID)": "Corp-WiFi", "Operating System": "Microsoft Windows 11 Pro", "Total RAM (GB)": "15.69",
+        "Disks": [("C:", f"{100 + index % 300}.25", "475.8"), ("D:", "812.4", "931.5")], "Brand": "Dell Inc.",
+        "Model": "Latitude 5420", "BIOS Serial": f"SN{index:08d}", "MAC": f"AA-BB-CC-{index // 65536 % 256:02X}-{index // 256 % 256:02X}-{index % 256:02X}",
+        "BIOS Version": "1.31.0", "Processor (CPU)": "11th Gen Intel(R) Core(TM) i7-1185G7 @ 3.00GHz",
+        "System Serial Number": f"SN{index:08d}", "Screen Resolution": "1920 x 1080", "Battery - Charge (%)": str(index % 101),
+        "Battery - Status": "2", "Battery - Capacity": str(52000 - index % 9000), "OS Installation Date": "2023-01-05 10:10:10",
+        "Last Boot": "2025-10-01 08:00:00", "Windows Version": "10.0.22631", "Windows Build": "22631", "Firewall Enabled": "Yes",
+    }
+
+# Latency of each probe through a warm PowerShell session as (median ms, p95 ms), from field measurements
+SIMULATED_LATENCY = {
+    "hostname": (8, 20), "ipv4": (120, 400), "wlan": (150, 600), "identity": (90, 250), "os": (40, 120),
+    "memory": (35, 100), "disks": (45, 150), "computer_system": (35, 100), "bios": (30, 90), "mac": (110, 350),
+    "processor": (40, 120), "product": (30, 90), "monitor": (60, 200), "battery": (80, 400), "firewall": (200, 700),
+}
+
+# Raw probe results returned by the simulated runner, shaped like the PowerShell JSON
+SIMULATED_RESULTS = {
+    "hostname": {"Name": "PC-000001"},
+    "ipv4": {"IPAddress": ["10.0.0.1"]},
+    "wlan": {"SSID": "Corp-WiFi"},
+    "identity": {"UUID": "4C4C4544-0042-3510-8052-B4C04F4E3332", "Name": "PC-000001", "LastBootUpTime": "20251001080000",
+                 "SMBIOSBIOSVersion": "1.31.0"},
+    "os": {"Caption": "Microsoft Windows 11 Pro", "Version": "10.0.22631", "BuildNumber": "22631", "InstallDate": "20230105101010",
+           "LastBootUpTime": "20251001080000"},
+    "memory": {"Capacity": 17179869184},
+    "disks": {"Disks": [{"DeviceID": "C:", "SizeGB": 475.8, "FreeGB": 100.25}, {"DeviceID": "D:", "SizeGB": 931.5, "FreeGB": 812.4}]},
+    "computer_system": {"Manufacturer": "Dell Inc.", "Model": "Latitude 5420"},
+    "bios": {"SerialNumber": "SN00000001", "SMBIOSBIOSVersion": "1.31.0"},
+    "mac": {"MacAddress": "AA-BB-CC-00-00-01"},
+    "processor": {"Name": ["11th Gen Intel(R) Core(TM) i7-1185G7 @ 3.00GHz"]},
+    "product": {"IdentifyingNumber": "SN00000001", "UUID": "4C4C4544-0042-3510-8052-B4C04F4E3332"},
+    "monitor": {"ScreenWidth": 1920, "ScreenHeight": 1080},
+    "battery": {"EstimatedChargeRemaining": 87, "BatteryStatus": 2, "FullChargedCapacity": 52000},
+    "firewall": {"Enabled": 1},
+}
+
+# Sigma of a log-normal distribution with the given median and p95 (p95 = median * e^(1.645 sigma))
+def log_normal_sigma(median, p95):
+    import math
+    return max(0.0, math.log(p95 / median) / 1.645)
+
+# Names of the probes in a script built by build_probe_script(), in the order it runs them
+def script_probe_names(script):
+    return re.findall(r"\$r\['(\w+)'\] = &", script)
+
+# Fake runner(script, timeout) for benchmarks: answers probe scripts with canned results after a
+# log-normal delay per probe. scale multiplies every delay; failure_rate is the share of runs that error.
+class SimulatedRunner:
+    def __init__(self, latency=None, scale=1.0, failure_rate=0.0, seed=None):
+        import random
+        self.latency = dict(SIMULATED_LATENCY, **(latency or {}))
+        self.sigma = {name: log_normal_sigma(median, p95) for name, (median, p95) in self.latency.items()}
+        self.scale = scale
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()  # random.Random is shared by the probe threads
+
+    def delay(self, name):
+        median = self.latency.get(name, (50, 150))[0]
+        with self.lock:
+            return self.random.lognormvariate(0.0, self.sigma.get(name, 0.67)) * median * self.scale / 1000
+
+    def __call__(self, script, timeout=None):
+        names = script_probe_names(script)
+        with self.lock:
+            failed = self.random.random() < self.failure_rate
+        delay = sum(self.delay(name) for name in names)
+        time.sleep(min(delay, timeout) if timeout else delay)
+        if failed or (timeout and delay > timeout):
+            return "Error: simulated failure"
+        return json.dumps({name: SIMULATED_RESULTS.get(name) for name in names})
+
+# Stand-in fleet transport: answers with canned results named after the host after a log-normal delay.
+# failure_rate of the attempts fail and hang_rate never answer, so timeouts and retries are exercised.
+class SimulatedTransport(Transport):
+    name = "simulated"
+
+    def __init__(self, latency=(800, 3000), scale=1.0, failure_rate=0.02, hang_rate=0.005, seed=None):
+        import random
+        self.median = latency[0] / 1000
+        self.sigma = log_normal_sigma(*latency)
+        self.scale = scale
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    async def run(self, host, script, timeout=None):
+        import asyncio
+        self.calls += 1
+        roll = self.random.random()
+        if roll < self.hang_rate:
+            await asyncio.sleep(3600)  # Ended by the per-host timeout
+        await asyncio.sleep(self.random.lognormvariate(0.0, self.sigma) * self.median * self.scale)
+        if roll < self.hang_rate + self.failure_rate:
+            raise TransportError("simulated connection failure")
+        results = {name: SIMULATED_RESULTS.get(name) for name in script_probe_names(script)}
+        results["hostname"] = {"Name": host}
+        results["identity"] = dict(SIMULATED_RESULTS["identity"], Name=host)
+        return json.dumps(results)
+
+# Collects growing simulated fleets and prints hosts/s and peak Python memory, which should stay flat
+def benchmark_fleet(hosts=1000, concurrency=100, scale=0.05, out=sys.stdout, seed=0):
+    import asyncio, random, tempfile, tracemalloc  # Imported before tracing so only the collection is measured
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in (max(1, hosts // 10), hosts):
+            transport = SimulatedTransport(scale=scale, seed=seed)
+            names = (f"PC-{index:06d}" for index in range(count))
+            tracemalloc.start()
+            summary = run_fleet(names, transport, os.path.join(tmp, "fleet.ndjson"), concurrency=concurrency,
+                                timeout=max(1.0, 20 * scale), retries=2, backoff=0.1 * scale)
+            summary["peak_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+            summary["attempts"] = transport.calls
+            results.append(summary)
+            print(f"{count:7d} hosts: {summary['hosts_per_s']:8.1f} hosts/s, {summary['elapsed']:6.2f} s, "
+                  f"{summary['ok']} ok, {summary['failed']} failed, {transport.calls} attempts, "
+                  f"peak memory {summary['peak_kb']:8.1f} KiB", file=out)
+    return results
+
+# Fills a history store with daily snapshots of a synthetic fleet (disks filling up, batteries wearing out)
+# and prints the import rate, the size on disk and how long the typical queries take
+def benchmark_history(hosts=1000, days=100, out=sys.stdout, seed=0):
+    import random, tempfile
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1).timestamp()
+
+    def snapshots():
+        for index in range(hosts):
+            data = sample_pc_data(index)
+            free, capacity = 50.0 + index % 400, 52000 - index % 9000
+            for day in range(days):
+                free = max(0.5, free - rng.uniform(0, 3))  # Disk slowly filling up
+                if rng.random() < 0.1:
+                    capacity -= rng.randint(50, 300)  # Battery wear
+                data["Disks"] = [("C:", f"{free:.2f}", "475.8"), ("D:", "812.4", "931.5")]
+                data["Battery - Capacity"] = str(capacity)
+                data["Battery - Charge (%)"] = str(rng.randint(5, 100))
+                yield data["Computer Name"], dict(data), start + (day * 86400 + index % 3600)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with HistoryStore(os.path.join(tmp, "history.sqlite")) as store:
+            started = time.perf_counter()
+            stored, _ = store.append_many(snapshots())
+            elapsed = time.perf_counter() - started
+            stats = store.stats()
+            fields = len(flatten_snapshot(sample_pc_data()))
+            print(f"stored {stored} snapshots ({stored * fields} field values) in {elapsed:.1f} s: {stored / elapsed:.0f} snapshots/s", file=out)
+            print(f"{stats['changes']} changes, {stats['values']} distinct values, {stats['bytes'] / 1024 / 1024:.1f} MiB "
+                  f"({stats['bytes'] / stored:.0f} bytes per snapshot)", file=out)
+            queries = [
+                ("free disk below 10 GB (now)", lambda: store.below("Disk % Free (GB)", 10)),
+                ("free disk dropped below 10 GB", lambda: store.dropped_below("Disk % Free (GB)", 10)),
+                ("battery capacity trend of one host", lambda: store.history("PC-000042", "Battery - Capacity")),
+                ("sheet of one host 50 days ago", lambda: store.snapshot_at("PC-000042", start + days // 2 * 86400)),
+            ]
+            results = {}
+            for label, query in queries:
+                started = time.perf_counter()
+                rows = query()
+                results[label] = time.perf_counter() - started
+                print(f"{label:<36}: {results[label] * 1000:8.1f} ms ({len(rows)} rows)", file=out)
+    return dict(stats, stored=stored, seconds=elapsed, queries=results)
+
+# Measures export rows per second of every format on synthetic snapshots and the memory the process grew by
+def benchmark_export(count=1000000, out=sys.stdout):
+    import tempfile
+    try:
+        import resource  # Unix only
+        peak_rss = lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        peak_rss = lambda: 0
+
+    def rows():
+        for index in range(count):
+            yield export_row(sample_pc_data(index), f"PC-{index:06d}", "2025-01-01T08:00:00")
+
+    started = time.perf_counter()
+    for _ in rows():
+        pass
+    generate = count / (time.perf_counter() - started)
+    print(f"generate rows only : {generate:10.0f} rows/s", file=out)
+    results = {"generate": generate}
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in EXPORTERS:
+            path = os.path.join(tmp, "export." + fmt)
+            rss = peak_rss()
+            started = time.perf_counter()
+            export_rows(rows(), fmt, path)
+            elapsed = time.perf_counter() - started
+            results[fmt] = count / max(1e-9, elapsed - count / generate)  # Writing only
+            print(f"{fmt:<6} {count} rows : {results[fmt]:10.0f} rows/s ({count / elapsed:.0f} with generation), "
+                  f"{os.path.getsize(path) / 1024 / 1024:7.1f} MiB, peak RSS grew {(peak_rss() - rss) / 1024:.1f} MiB", file=out)
+    return results
+
+# Runs the full pipeline (collect, format_sheet, create_pdf_sheet) against the simulated runner and
+# prints p50/p95 per stage and per probe; returns the Timings
+def benchmark_pipeline(runs=20, scale=1.0, failure_rate=0.0, lang=None, out=sys.stdout, seed=0):
+    import tempfile
+    runner = SimulatedRunner(scale=scale, failure_rate=failure_rate, seed=seed)
+    outer = disable_timings()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sheet.pdf")
+        create_pdf_sheet(sample_pc_data(), path, lang)  # Warm-up, not measured: imports fpdf and prepares the renderer
+        timings = enable_timings()
+        try:
+            for _ in range(runs):
+                with timed("pipeline", "total"):
+                    data = get_pc_data(runner=runner)
+                    format_sheet(data, lang)
+                    create_pdf_sheet(data, path, lang)
+        finally:
+            disable_timings()
+            if outer is not None:
+                enable_timings(outer)
+    if outer is not None:
+        with outer.lock:
+            outer.records.extend(timings.records)  # Also exported by --timings
+    print(f"{runs} run(s), latency scale {scale}, failure rate {failure_rate}", file=out)
+    timings.print_summary(out)
+    return timings
+
+# Measures sheets per second of the legacy PDF function, the renderer, and the multi-sheet document mode
+def benchmark_pdf(count=500, lang=None, out=sys.stdout):
+    import tempfile
+    datas = [sample_pc_data(i) for i in range(count)]
+    renderer = get_sheet_renderer(lang)
+    pinned = datetime(2025, 1, 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sheet.pdf")
+        started = time.perf_counter()
+        for data in datas:
+            create_pdf_sheet_legacy(data, path, lang)
+        legacy = count / (time.perf_counter() - started)
+        started = time.perf_counter()
+        for data in datas:
+            renderer.render(data, path)
+        single = count / (time.perf_counter() - started)
+        started = time.perf_counter()
+        renderer.render_pages(datas, path)
+        pages = count / (time.perf_counter() - started)
+        started = time.perf_counter()
+        renderer.render_table(datas, path)
+        table = count / (time.perf_counter() - started)
+        identical = True
+        for data in datas[:20]:  # The renderer must draw exactly what the legacy function draws
+            create_pdf_sheet_legacy(data, path, lang)
+            with open(path, 'rb') as f:
+                identical &= _pin_creation_date(f.read(), pinned) == renderer.render(data, creation_date=pinned)
+    print(f"legacy create_pdf_sheet : {legacy:10.1f} sheets/s", file=out)
+    print(f"SheetRenderer.render    : {single:10.1f} sheets/s  (x{single / legacy:.2f})", file=out)
+    print(f"render_pages (1 PDF)    : {pages:10.1f} sheets/s  (x{pages / legacy:.2f})", file=out)
+    print(f"render_table (1 PDF)    : {table:10.1f} sheets/s  (x{table / legacy:.2f})", file=out)
+    print(f"byte-identical output   : {identical}", file=out)
+    return {"legacy": legacy, "render": single, "pages": pages, "table": table, "identical": identical}
+
+# Command line entry point: without a command the GUI starts
+def main(argv=None):
+    if not STARTUP_TIMES:
+        STARTUP_TIMES.append(("imports", 0.0, time.perf_counter() - _startup_t0))
+    parser = argparse.ArgumentParser(prog=NOMBRE_MARCA, description="System technical sheets for one or many machines.")
+    parser.add_argument("--startup-times", action="store_true", help="print how long each startup phase took (GUI)")
+    parser.add_argument("--timings", metavar="FILE", help="time every probe and stage and write them as JSON to FILE (- prints a table to stderr)")
+    commands = parser.add_subparsers(dest="command")
+    collect = commands.add_parser("collect", help="collect this machine's data as a JSON snapshot")
+    collect.add_argument("-o", "--output", help="write to this file instead of stdout")
+    collect.add_argument("--append", action="store_true", help="append one NDJSON line to the output file")
+    collect.add_argument("--backend", choices=["powershell", "wmi", "linux"], help="collector backend (default: auto)")
+    collect.add_argument("--timeout", type=float, default=PROBE_TIMEOUT, help="seconds per probe (default: %(default)s)")
+    collect.add_argument("--history", nargs="?", const="", metavar="DB", help="also store the snapshot in the history database")
+    fleet = commands.add_parser("fleet", help="collect many machines through a remote transport into NDJSON")
+    fleet.add_argument("hosts", nargs="+", help="host names, or @FILE with one host per line (@- reads stdin)")
+    fleet.add_argument("-o", "--output", default="-", help="NDJSON output file (default: stdout)")
+    fleet.add_argument("--append", action="store_true", help="append to the output file")
+    fleet.add_argument("--transport", choices=sorted(FLEET_TRANSPORTS) + ["simulated"], default="winrm" if os.name == "nt" else "ssh",
+                       help="remote execution (default: %(default)s)")
+    fleet.add_argument("-c", "--concurrency", type=int, default=FLEET_CONCURRENCY, help="hosts at once (default: %(default)s)")
+    fleet.add_argument("--timeout", type=float, default=FLEET_TIMEOUT, help="seconds per host and attempt (default: %(default)s)")
+    fleet.add_argument("--retries", type=int, default=FLEET_RETRIES, help="extra attempts per host (default: %(default)s)")
+    fleet.add_argument("--backoff", type=float, default=FLEET_BACKOFF, help="seconds before the first retry (default: %(default)s)")
+    fleet.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    render = commands.add_parser("render", help="render saved snapshots as PDF and/or text sheets")
+    render.add_argument("inputs", nargs="+", help="snapshot files (.json, .ndjson), directories, or - for NDJSON on stdin")
+    render.add_argument("-d", "--out-dir", default=".", help="output directory (default: current directory)")
+    render.add_argument("-f", "--format", action="append", choices=["pdf", "txt"], help="output format, repeatable (default: pdf and txt)")
+    render.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker processes (default: %(default)s)")
+    render.add_argument("--lang", choices=sorted(traducciones), default=idioma_actual, help="sheet language (default: %(default)s)")
+    render.add_argument("--chunk-size", type=int, default=16, help="sheets per task sent to a worker (default: %(default)s)")
+    render.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    render.add_argument("--combined", help="also write all sheets into this PDF, one page per machine")
+    render.add_argument("--table", help="also write a consolidated table of all machines to this PDF")
+    export = commands.add_parser("export", help="export snapshots as NDJSON, CSV or a JSON array for other tools")
+    export.add_argument("inputs", nargs="*", help="snapshot files (.json, .ndjson), directories, or - for NDJSON on stdin")
+    export.add_argument("-f", "--format", choices=sorted(EXPORTERS), default="csv", help="output format (default: %(default)s)")
+    export.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    export.add_argument("--history", nargs="?", const="", metavar="DB", help="export the latest sheet of every host in the history database")
+    history = commands.add_parser("history", help="store snapshots over time and query how machines changed")
+    history.add_argument("--db", help="history database (default: history.sqlite in the user data directory)")
+    actions = history.add_subparsers(dest="action", required=True)
+    history_add = actions.add_parser("add", help="store snapshots from collect or fleet output")
+    history_add.add_argument("inputs", nargs="+", help="snapshot files (.json, .ndjson), directories, or - for NDJSON on stdin")
+    history_show = actions.add_parser("show", help="print a host's sheet as it was at a given time")
+    history_show.add_argument("host")
+    history_show.add_argument("--at", help="ISO date and time (default: latest)")
+    history_trend = actions.add_parser("trend", help="print every change of one field of a host")
+    history_trend.add_argument("host")
+    history_trend.add_argument("field", help='field name, e.g. "Battery - Capacity" or "Disk C: Free (GB)"')
+    history_below = actions.add_parser("below", help="hosts whose field is below a threshold")
+    history_below.add_argument("field", help='field name; %% matches anything, e.g. "Disk %% Free (GB)"')
+    history_below.add_argument("threshold", type=float)
+    history_below.add_argument("--dropped", action="store_true", help="list every time the value fell below the threshold instead")
+    history_below.add_argument("--since", help="with --dropped: only changes after this ISO date")
+    actions.add_parser("stats", help="print the size of the history")
+    bench = commands.add_parser("bench", help="run a benchmark")
+    bench.add_argument("target", choices=["pdf", "pipeline", "fleet", "history", "export"], help="what to measure")
+    bench.add_argument("-n", "--count", type=int, help="number of sheets (pdf, default: 500), pipeline runs (default: 20), "
+                                                       "hosts (fleet and history, default: 1000) or rows (export, default: 1000000)")
+    bench.add_argument("--latency-scale", type=float, default=1.0, help="pipeline: multiply simulated probe latencies (default: %(default)s)")
+    bench.add_argument("--failure-rate", type=float, default=0.0, help="pipeline: share of probe runs that fail (default: %(default)s)")
+    with startup_phase("argument parsing"):
+        args = parser.parse_args(argv)
+    if not args.timings:
+        return run_command(parser, args)
+    timings = enable_timings()
+    try:
+        return run_command(parser, args)
+    finally:
+        disable_timings()
+        timings.save(args.timings)
+
+# Runs a history subcommand
+def run_history(args):
+    with HistoryStore(args.db) as store:
+        if args.action == "add":
+            failures = []
+            stored, skipped = store.append_many(store.records_to_snapshots(iter_records(args.inputs), failures))
+            failures += skipped
+            print(f"Stored {stored} snapshot(s)", file=sys.stderr)
+            for name, error in failures:
+                print(f"SKIPPED {name}: {error}", file=sys.stderr)
+            return 1 if failures else 0
+        if args.action == "show":
+            data = store.snapshot_at(args.host, args.at)
+            if not data:
+                print(f"No history for {args.host}", file=sys.stderr)
+                return 1
+            print(format_sheet(data))
+        elif args.action == "trend":
+            for stamp, value in store.history(args.host, args.field):
+                print(f"{_iso(stamp)}  {'(removed)' if value is None else value}")
+        elif args.action == "below":
+            if args.dropped:
+                for host, field, stamp, before, after in store.dropped_below(args.field, args.threshold, args.since):
+                    print(f"{_iso(stamp)}  {host}  {field}: {before:g} -> {after:g}")
+            else:
+                for host, field, value, stamp in store.below(args.field, args.threshold):
+                    print(f"{host}  {field}: {value:g} (since {_iso(stamp)})")
+        else:
+            for key, value in store.stats().items():
+                print(f"{key}: {value}")
+    return 0
+
+# Runs the command chosen on the command line
+def run_command(parser, args):
+    if args.command is None:
+        global REPORT_STARTUP
+        REPORT_STARTUP = REPORT_STARTUP or args.startup_times
+        if tk is None:
+            parser.error("tkinter is not available; use the collect or render commands")
+        splash_window()  # Start the application with the splash window
+        return 0
+    if args.command == "collect":
+        data = get_pc_data(timeout=args.timeout, collector=get_collector(args.backend))
+        host, collected = snapshot_host(data) or socket.gethostname(), datetime.now().isoformat(timespec="seconds")
+        record = dict({"Host": host, "Collected": collected}, **snapshot_to_json(data))  # Same leading fields as fleet records
+        text = json.dumps(record, ensure_ascii=False)
+        if args.output:
+            with open(args.output, "a" if args.append else "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        if args.history is not None:
+            with HistoryStore(args.history or None) as store:
+                store.append(host, data, collected)
+        return 0
+    if args.command == "history":
+        return run_history(args)
+    if args.command == "export":
+        failures = []
+        if args.history is not None:
+            with HistoryStore(args.history or None) as store:
+                rows = (export_row(data, host, datetime.fromtimestamp(stamp).isoformat(timespec="seconds"))
+                        for host, data, stamp in store.iter_latest())
+                export_rows(rows, args.format, args.output)
+        elif args.inputs:
+            export_rows(iter_export_rows(args.inputs, failures), args.format, args.output)
+        else:
+            parser.error("export needs input files or --history")
+        for name, error in failures:
+            print(f"SKIPPED {name}: {error}", file=sys.stderr)
+        return 1 if failures else 0
+    if args.command == "fleet":
+        summary = run_fleet(iter_hosts(args.hosts), get_transport(args.transport), args.output, concurrency=args.concurrency,
+                            timeout=args.timeout, retries=max(0, args.retries), backoff=args.backoff, append=args.append,
+                            progress=None if args.quiet else print_fleet_progress)
+        if not args.quiet:
+            print(f"\nDone in {summary['elapsed']:.1f} s: {summary['ok']} ok, {summary['failed']} failed", file=sys.stderr)
+        return 1 if summary["failed"] else 0
+    if args.command == "bench":
+        if args.target == "pipeline":
+            benchmark_pipeline(args.count or 20, args.latency_scale, args.failure_rate)
+        elif args.target == "fleet":
+            benchmark_fleet(args.count or 1000)
+        elif args.target == "history":
+            benchmark_history(args.count or 1000)
+        elif args.target == "export":
+            benchmark_export(args.count or 1000000)
+        else:
+            benchmark_pdf(args.count or 500)
+        return 0
+    started = time.monotonic()
+    failures = render_snapshots(args.inputs, args.out_dir, tuple(args.format or ("pdf", "txt")), args.lang,
+                                max(1, args.workers or 1), max(1, args.chunk_size), None if args.quiet else print_progress,
+                                args.combined, args.table)
+    if not args.quiet:
+        print(f"\nDone in {time.monotonic() - started:.1f} s", file=sys.stderr)
+    for name, error in failures:
+        print(f"FAILED {name}: {error}", file=sys.stderr)  # Summary of failures
+    return 1 if failures else 0
 
 # Run the app
-splash_window()  # Start the application with the splash window
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,7 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+# Keeps the repository root on sys.path so the tests can import SheetXpert.py
@@ -0,0 +1,12 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+# Entry point for "python -m sheetxpert collect|render"
+import sys  # For the exit code
+
+from SheetXpert import main  # The application module next to this package
+
+sys.exit(main())
@@ -0,0 +1,34 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+# Stand-in for the PowerShell worker: speaks the same "<id> <verb> <base64>" framing.
+# A "run" payload is a command: "echo TEXT", "sleep SECONDS", "error TEXT", "crash", "pid" or "bom TEXT".
+import base64
+import os
+import sys
+import time
+
+sys.stdout.reconfigure(encoding="utf-8")
+print("fake worker ready")  # Stray output must be ignored
+for line in sys.stdin:
+    request_id, verb, payload = (line.rstrip("\n").split(" ", 2) + ["", ""])[:3]
+    if verb == "ping":
+        print(f"{request_id} pong ", flush=True)
+        continue
+    command, _, argument = base64.b64decode(payload).decode("utf-8").partition(" ")
+    status, out, prefix = "ok", argument, ""
+    if command == "sleep":
+        time.sleep(float(argument))
+    elif command == "error":
+        status = "error"
+    elif command == "crash":
+        sys.exit(1)
+    elif command == "pid":
+        out = str(os.getpid())
+    elif command == "bom":
+        prefix = "\ufeff"  # What a console encoding change to UTF-8 with BOM looks like on the wire
+        out = "\ufeff" + argument
+    print(f"{prefix}{request_id} {status} {base64.b64encode(out.encode('utf-8')).decode('ascii')}", flush=True)
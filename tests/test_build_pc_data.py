@@ -0,0 +1,67 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import json
+
+import SheetXpert as S
+
+# Raw probe results as PowerShell's ConvertTo-Json prints them
+CANNED = {
+    "hostname": {"Name": "PC-01"},
+    "ipv4": {"IPAddress": ["192.168.1.10", "10.0.0.5"]},
+    "wlan": {"SSID": "Oficina"},
+    "identity": {"UUID": "U-1", "Name": "PC-01", "LastBootUpTime": "20250301081500", "SMBIOSBIOSVersion": "1.2.3"},
+    "os": {"Caption": "Microsoft Windows 11 Pro", "Version": "10.0.22631", "BuildNumber": "22631", "InstallDate": "20230105101010"},
+    "memory": {"Capacity": 17179869184},
+    "disks": {"Disks": {"DeviceID": "C:", "SizeGB": 475.8, "FreeGB": 100.25}},  # One disk: an object, not a list
+    "computer_system": {"Manufacturer": "Dell Inc.", "Model": "Latitude 5420"},
+    "bios": {"SerialNumber": "ABC123"},
+    "mac": {"MacAddress": "AA-BB-CC-DD-EE-FF"},
+    "processor": {"Name": "Intel(R) Core(TM) i7"},
+    "product": {"IdentifyingNumber": "ABC123"},
+    "monitor": {"ScreenWidth": 1920, "ScreenHeight": 1080},
+    "battery": {"EstimatedChargeRemaining": 80, "BatteryStatus": 2, "FullChargedCapacity": 52000},
+    "firewall": {"Enabled": True},
+}
+
+# Stand-in for run_powershell: answers each probe script with the canned JSON of its probes
+def canned_runner(canned):
+    def runner(script, timeout=None):
+        return json.dumps({name: canned.get(name) for name in S.script_probe_names(script)})
+    return runner
+
+def test_build_pc_data_from_canned_json():
+    data = S.build_pc_data(CANNED)
+    assert list(data) == [key for key in S.FIELD_ORDER if key in data]
+    assert data["Computer Name"] == "PC-01"
+    assert data["IPv4 Address(es)"] == "192.168.1.10, 10.0.0.5"
+    assert data["Total RAM (GB)"] == "16.0"
+    assert data["Disks"] == [("C:", "100.25", "475.8")]
+    assert data["Screen Resolution"] == "1920 x 1080"
+    assert data["Last Boot"] == "2025-03-01 08:15:00"
+    assert data["BIOS Version"] == "1.2.3"
+    assert data["Firewall Enabled"] == "Yes"
+
+def test_disk_list_and_missing_values():
+    raw = dict(CANNED, disks={"Disks": [{"DeviceID": "C:", "SizeGB": 1, "FreeGB": 0.5}, {"DeviceID": "D:", "SizeGB": 2, "FreeGB": 1}]},
+               memory={"Capacity": None}, monitor={"ScreenWidth": None, "ScreenHeight": None})
+    data = S.build_pc_data(raw)
+    assert data["Disks"] == [("C:", "0.5", "1"), ("D:", "1", "2")]
+    assert "Total RAM (GB)" not in data
+    assert "Screen Resolution" not in data
+
+def test_firewall_mapping():
+    for enabled, shown in ((True, "Yes"), (1, "Yes"), ("1", "Yes"), (False, "No"), (0, "No"), (None, "Unknown")):
+        assert S.build_pc_data({"firewall": {"Enabled": enabled}})["Firewall Enabled"] == shown
+
+def test_get_pc_data_with_canned_runner():
+    data = S.get_pc_data(runner=canned_runner(CANNED), timeout=5)
+    assert data == S.build_pc_data(CANNED)
+
+def test_failed_probe_leaves_its_fields_out():
+    data = S.get_pc_data(runner=canned_runner(dict(CANNED, bios=None)), timeout=5)
+    assert "BIOS Serial" not in data
+    assert data["System Serial Number"] == "ABC123"
@@ -0,0 +1,76 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import SheetXpert as S
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def write_records(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps(dict({"Host": f"pc-{i}", "Collected": "2025-06-01T09:00:00"}, **S.snapshot_to_json(S.sample_pc_data(i)))) + "\n")
+
+def export(rows, fmt):
+    out = io.StringIO(newline="")
+    assert S.EXPORTERS[fmt](rows, out) == len(rows)
+    return out.getvalue()
+
+def test_csv_header_is_every_column():
+    rows = list(csv.reader(io.StringIO(export([S.export_row(S.sample_pc_data(1), "pc-1")], "csv"))))
+    assert tuple(rows[0]) == S.EXPORT_COLUMNS
+    assert len(rows[1]) == len(S.EXPORT_COLUMNS)
+    assert list(csv.reader(io.StringIO(export([], "csv")))) == [list(S.EXPORT_COLUMNS)]
+
+def test_disk_slots_and_other_disks():
+    disks = [(f"{chr(ord('C') + i)}:", str(10 * i), "100") for i in range(S.EXPORT_DISK_SLOTS + 2)]
+    row = dict(zip(S.EXPORT_COLUMNS, S.export_row(dict(S.sample_pc_data(1), Disks=disks))))
+    for slot, (device, free, size) in enumerate(disks[:S.EXPORT_DISK_SLOTS], 1):
+        assert (row[f"Disk {slot} Device"], row[f"Disk {slot} Free (GB)"], row[f"Disk {slot} Size (GB)"]) == (device, free, size)
+    assert row["Other Disks"] == "; ".join(f"{device}={free}/{size}" for device, free, size in disks[S.EXPORT_DISK_SLOTS:])
+    row = dict(zip(S.EXPORT_COLUMNS, S.export_row(dict(S.sample_pc_data(1), Disks=[("C:", "1", "2")]))))
+    assert (row["Disk 2 Device"], row["Other Disks"]) == ("", "")
+    row = dict(zip(S.EXPORT_COLUMNS, S.export_row(dict(S.sample_pc_data(1), Disks=S.UNAVAILABLE))))
+    assert (row["Disk 1 Device"], row["Other Disks"]) == ("", S.UNAVAILABLE)
+
+@pytest.mark.parametrize("count", [0, 1, 3])
+def test_json_is_one_valid_array(count):
+    rows = [S.export_row(S.sample_pc_data(i), f"pc-{i}") for i in range(count)]
+    records = json.loads(export(rows, "json"))
+    assert [record["Host"] for record in records] == [f"pc-{i}" for i in range(count)]
+    assert all("" not in record.values() for record in records)  # Empty columns are left out
+
+def test_ndjson_is_one_object_per_line():
+    rows = [S.export_row(S.sample_pc_data(i), f"pc-{i}", "2025-06-01T09:00:00") for i in range(3)]
+    lines = export(rows, "ndjson").splitlines()
+    assert len(lines) == 3
+    records = [json.loads(line) for line in lines]
+    assert records[1] == {column: value for column, value in zip(S.EXPORT_COLUMNS, rows[1]) if value}
+
+def test_closed_stdout_is_not_an_error(monkeypatch):
+    class ClosedPipe(io.StringIO):
+        def write(self, text):
+            raise BrokenPipeError(32, "Broken pipe")
+    monkeypatch.setattr("sys.stdout", ClosedPipe())
+    assert S.export_rows([S.export_row(S.sample_pc_data(1))], "ndjson") is None
+
+def test_export_piped_into_head(tmp_path):
+    write_records(tmp_path / "fleet.ndjson", 2000)  # Far more than a pipe buffer
+    process = subprocess.Popen([sys.executable, "-m", "sheetxpert", "export", str(tmp_path / "fleet.ndjson"), "-f", "csv"],
+                               cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert process.stdout.readline().decode("utf-8").startswith("Host,Collected,")
+    process.stdout.close()  # What head does after its lines
+    assert process.wait(timeout=60) == 0
+    assert process.stderr.read() == b""
+    process.stderr.close()
@@ -0,0 +1,128 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+import SheetXpert as S
+
+HOSTS = [f"pc-{i:03d}" for i in range(20)]
+
+# Simulated transport with a fixed 20 ms latency that also tracks how many hosts run at once
+class CountingTransport(S.SimulatedTransport):
+    def __init__(self, **options):
+        super().__init__(latency=(20, 20), **dict({"failure_rate": 0.0, "hang_rate": 0.0, "seed": 0}, **options))
+        self.active = 0
+        self.peak = 0
+        self.per_host = {}
+
+    async def run(self, host, script, timeout=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.per_host[host] = self.per_host.get(host, 0) + 1
+        try:
+            return await super().run(host, script, timeout)
+        finally:
+            self.active -= 1
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_every_host_gets_a_record(tmp_path):
+    transport = CountingTransport()
+    summary = S.run_fleet(HOSTS, transport, str(tmp_path / "fleet.ndjson"), concurrency=4, timeout=5)
+    records = read_records(tmp_path / "fleet.ndjson")
+    assert sorted(record["Host"] for record in records) == HOSTS
+    assert all(record["Computer Name"] == record["Host"] and record["Attempts"] == 1 and "Error" not in record for record in records)
+    assert (summary["ok"], summary["failed"], summary["hosts"]) == (20, 0, 20)
+    assert transport.calls == 20
+
+def test_concurrency_stays_at_the_limit(tmp_path):
+    transport = CountingTransport()
+    S.run_fleet(iter(HOSTS), transport, str(tmp_path / "fleet.ndjson"), concurrency=4, timeout=5)
+    assert transport.peak == 4
+    transport = CountingTransport()
+    S.run_fleet(HOSTS[:3], transport, str(tmp_path / "fleet.ndjson"), concurrency=8, timeout=5)
+    assert transport.peak == 3
+
+def test_timeouts_are_retried_then_reported(tmp_path):
+    transport = CountingTransport(hang_rate=1.0)
+    summary = S.run_fleet(HOSTS[:5], transport, str(tmp_path / "fleet.ndjson"), concurrency=5, timeout=0.05, retries=2, backoff=0.01)
+    records = read_records(tmp_path / "fleet.ndjson")
+    assert transport.calls == 15
+    assert all(record["Attempts"] == 3 and record["Error"] == "timed out after 0.05 s" for record in records)
+    assert all("Computer Name" not in record for record in records)
+    assert (summary["ok"], summary["failed"]) == (0, 5)
+
+def test_failures_become_error_records(tmp_path):
+    transport = CountingTransport(failure_rate=1.0)
+    S.run_fleet(HOSTS[:3], transport, str(tmp_path / "fleet.ndjson"), concurrency=2, timeout=5, retries=1, backoff=0.01)
+    records = read_records(tmp_path / "fleet.ndjson")
+    assert transport.per_host == {host: 2 for host in HOSTS[:3]}
+    assert {record["Error"] for record in records} == {"TransportError: simulated connection failure"}
+    assert all(set(record) == {"Host", "Collected", "Attempts", "Error"} for record in records)
+
+def test_a_retry_can_succeed(tmp_path):
+    class FlakyTransport(CountingTransport):
+        async def run(self, host, script, timeout=None):
+            if host not in self.per_host:
+                self.per_host[host] = 1
+                raise S.TransportError("first attempt fails")
+            return await super().run(host, script, timeout)
+
+    transport = FlakyTransport()
+    summary = S.run_fleet(HOSTS[:4], transport, str(tmp_path / "fleet.ndjson"), concurrency=2, timeout=5, retries=2, backoff=0.01)
+    assert summary["ok"] == 4
+    assert all(record["Attempts"] == 2 and "Error" not in record for record in read_records(tmp_path / "fleet.ndjson"))
+
+def test_records_are_streamed(tmp_path):
+    path = tmp_path / "fleet.ndjson"
+    seen = []
+
+    class PeekingTransport(CountingTransport):
+        async def run(self, host, script, timeout=None):
+            seen.append(len(read_records(path)))  # Lines already on disk when this host starts
+            return await super().run(host, script, timeout)
+
+    progress = []
+    S.run_fleet(HOSTS[:5], PeekingTransport(), str(path), concurrency=1, timeout=5, progress=lambda done, failed: progress.append(done))
+    assert seen == [0, 1, 2, 3, 4]
+    assert progress == [1, 2, 3, 4, 5]
+
+def test_append(tmp_path):
+    path = str(tmp_path / "fleet.ndjson")
+    S.run_fleet(HOSTS[:2], CountingTransport(), path, concurrency=2, timeout=5)
+    S.run_fleet(HOSTS[2:4], CountingTransport(), path, concurrency=2, timeout=5, append=True)
+    assert sorted(record["Host"] for record in read_records(path)) == HOSTS[:4]
+
+def test_unsafe_host_names_are_never_run(tmp_path):
+    transport = CountingTransport()
+    hosts = ["pc1; Remove-Item C:\\", "-oProxyCommand=calc", "pc 2", "$(calc)", "", "pc-ok", "10.0.0.5", "admin@pc-3", "fe80::1"]
+    S.run_fleet(hosts, transport, str(tmp_path / "fleet.ndjson"), concurrency=2, timeout=5)
+    records = {record["Host"]: record for record in read_records(tmp_path / "fleet.ndjson")}
+    assert set(transport.per_host) == {"pc-ok", "10.0.0.5", "admin@pc-3", "fe80::1"}
+    for host in hosts[:5]:
+        assert records[host]["Error"] == "invalid host name" and records[host]["Attempts"] == 0
+
+def test_winrm_command_line():
+    command = S.FLEET_TRANSPORTS["winrm"][-1]
+    assert "-ComputerName '{host}'" in command
+    assert command.startswith("[Console]::OutputEncoding")
+
+def test_command_transport_substitutes_host_and_script():
+    transport = S.CommandTransport([sys.executable, "-c", "import base64, sys; print(sys.argv[1], base64.b64decode(sys.argv[2]).decode('utf-16-le'))", "{host}", "{encoded}"])
+    assert asyncio.run(transport.run("pc-01", "Get-Date", timeout=10)).split() == ["pc-01", "Get-Date"]
+    failing = S.CommandTransport([sys.executable, "-c", "import sys; sys.exit('access denied')"])
+    try:
+        asyncio.run(failing.run("pc-01", "Get-Date", timeout=10))
+    except S.TransportError as e:
+        assert str(e) == "access denied"
+    else:
+        raise AssertionError("TransportError not raised")
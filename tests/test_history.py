@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import csv
+import json
+import socket
+from datetime import datetime
+
+import pytest
+
+import SheetXpert as S
+
+@pytest.fixture
+def store(tmp_path):
+    with S.HistoryStore(str(tmp_path / "history.db")) as store:
+        yield store
+
+def record(data, **extra):
+    return dict(S.snapshot_to_json(data), **extra)
+
+def test_records_use_host_then_computer_name():
+    failures = []
+    records = [("a", record(S.sample_pc_data(1), Host="pc-a"), None),
+               ("b", record(S.sample_pc_data(2)), None),
+               ("c", record(dict(S.sample_pc_data(3), **{"Computer Name": S.UNAVAILABLE}), Host="pc-c"), None),
+               ("d", record(dict(S.sample_pc_data(4), **{"Computer Name": S.UNAVAILABLE})), None),
+               ("e", None, "bad json")]
+    hosts = [host for host, _, _ in S.HistoryStore.records_to_snapshots(records, failures)]
+    assert hosts == ["pc-a", "PC-000002", "pc-c"]
+    assert [name for name, _ in failures] == ["d", "e"]
+
+def test_snapshot_host():
+    assert S.snapshot_host({"Computer Name": "PC-01"}) == "PC-01"
+    assert S.snapshot_host({"Computer Name": S.UNAVAILABLE}) is None
+    assert S.snapshot_host({}) is None
+
+def test_collect_history_never_files_under_unavailable(tmp_path, monkeypatch):
+    data = dict(S.sample_pc_data(1), **{"Computer Name": S.UNAVAILABLE})
+    monkeypatch.setattr(S, "get_pc_data", lambda *args, **kwargs: data)
+    path = str(tmp_path / "history.db")
+    assert S.main(["collect", "--history", path, "-o", str(tmp_path / "sheet.json")]) == 0
+    with S.HistoryStore(path) as store:
+        assert store.hosts() == [socket.gethostname()]
+
+def test_unavailable_fields_keep_their_last_value(store):
+    store.append("pc-a", S.sample_pc_data(1), 1000)
+    store.append("pc-a", dict(S.sample_pc_data(1), **{"Total RAM (GB)": S.UNAVAILABLE}), 2000)
+    assert store.snapshot_at("pc-a")["Total RAM (GB)"] == "15.69"
+
+def test_latest_is_dated_by_the_last_snapshot(store):
+    store.append("pc-a", S.sample_pc_data(1), 1000)
+    store.append("pc-a", S.sample_pc_data(1), 5000)  # Nothing changed, but it was collected again
+    store.append("pc-b", S.sample_pc_data(2), 3000)
+    latest = {host: (data, stamp) for host, data, stamp in store.iter_latest()}
+    assert latest["pc-a"][1] == 5000
+    assert latest["pc-b"][1] == 3000
+    assert latest["pc-a"][0] == S.sample_pc_data(1)
+
+def test_export_history_collected_column(tmp_path):
+    path = str(tmp_path / "history.db")
+    with S.HistoryStore(path) as store:
+        store.append("pc-a", S.sample_pc_data(1), 1000)
+        store.append("pc-a", S.sample_pc_data(1), 5000)
+    out = str(tmp_path / "latest.csv")
+    assert S.main(["export", "--history", path, "-f", "csv", "-o", out]) == 0
+    with open(out, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["Collected"] == datetime.fromtimestamp(5000).isoformat(timespec="seconds")
+
+def test_unavailable_disks_keep_their_last_values(store):
+    store.append("pc", S.sample_pc_data(1), 1000)
+    store.append("pc", dict(S.sample_pc_data(1), Disks=S.UNAVAILABLE), 2000)
+    assert store.history("pc", "Disk C: Free (GB)") == [(1000, 101.25)]
+    assert [host for host, _, _, _ in store.below("Disk % Free (GB)", 1000)] == ["pc", "pc"]
+    assert store.snapshot_at("pc")["Disks"] == S.sample_pc_data(1)["Disks"]
+
+def test_collect_output_is_ready_for_history_add(tmp_path, monkeypatch):
+    monkeypatch.setattr(S, "get_pc_data", lambda *args, **kwargs: S.sample_pc_data(1))
+    out = str(tmp_path / "inventory.ndjson")
+    assert S.main(["collect", "-o", out, "--append"]) == 0
+    with open(out, encoding="utf-8") as f:
+        record = json.loads(f.readline())
+    assert list(record)[:2] == ["Host", "Collected"]
+    assert record["Host"] == "PC-000001"
+    assert S.snapshot_from_json(record) == S.sample_pc_data(1)
+
+def test_history_add_keeps_daily_collect_lines_and_is_idempotent(tmp_path):
+    lines = tmp_path / "inventory.ndjson"
+    with open(lines, "w", encoding="utf-8") as f:
+        for day, free in ((1, "100"), (2, "50"), (3, "10")):
+            data = dict(S.sample_pc_data(1), Disks=[("C:", free, "475.8")])
+            f.write(json.dumps(dict({"Host": "pc-a", "Collected": f"2025-06-0{day}T09:00:00"}, **S.snapshot_to_json(data))) + "\n")
+    db = str(tmp_path / "history.db")
+    assert S.main(["history", "--db", db, "add", str(lines)]) == 0
+    assert S.main(["history", "--db", db, "add", str(lines)]) == 0  # Already imported: nothing stored, nothing reported
+    with S.HistoryStore(db) as store:
+        assert [value for _, value in store.history("pc-a", "Disk C: Free (GB)")] == [100.0, 50.0, 10.0]
+        assert store.stats()["snapshots"] == 3
+
+def test_same_snapshot_twice_is_stored_once(store):
+    assert store.append("pc-a", S.sample_pc_data(1), 1000) is not None
+    assert store.append("pc-a", S.sample_pc_data(1), 1000) is None
+    assert store.append_many([("pc-a", S.sample_pc_data(1), 1000)]) == (0, [])
+    assert store.stats()["snapshots"] == 1
+    store.append("pc-a", S.sample_pc_data(2), 2000)
+    assert store.append("pc-a", S.sample_pc_data(1), 1000) is None  # Older, but already stored
+    with pytest.raises(ValueError):
+        store.append("pc-a", S.sample_pc_data(1), 1500)
@@ -0,0 +1,96 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import json
+import threading
+import time
+
+import pytest
+
+import SheetXpert as S
+
+# Fake runner(script, timeout): answers each probe with its simulated result after a fixed delay.
+# Probes listed in hang never answer until release() is called.
+class DelayRunner:
+    def __init__(self, delays=None, hang=()):
+        self.delays = delays or {}
+        self.hang = set(hang)
+        self.released = threading.Event()
+        self.started = []
+
+    def __call__(self, script, timeout=None):
+        names = S.script_probe_names(script)
+        self.started.extend(names)
+        if self.hang & set(names):
+            self.released.wait()
+        else:
+            time.sleep(sum(self.delays.get(name, 0.0) for name in names))
+        return json.dumps({name: S.SIMULATED_RESULTS.get(name) for name in names})
+
+    def release(self):
+        self.released.set()
+
+@pytest.fixture
+def make_runner():
+    runners = []
+    def make(delays=None, hang=()):
+        runners.append(DelayRunner(delays, hang))
+        return runners[-1]
+    yield make
+    for runner in runners:
+        runner.release()  # Let abandoned probe threads finish
+
+def probe_with(runner):
+    return lambda name, timeout=None: S.powershell_probe(name, timeout, runner)
+
+def test_total_time_is_the_slowest_probe(make_runner):
+    delays = {name: 0.05 for name in S.PS_PROBES}
+    delays["disks"] = 0.4
+    runner = make_runner(delays)
+    started = time.monotonic()
+    results = dict(S.iter_probes(list(S.PS_PROBES), probe_with(runner), timeout=5, max_workers=len(S.PS_PROBES)))
+    elapsed = time.monotonic() - started
+    assert set(results) == set(S.PS_PROBES)
+    assert results["disks"] == S.SIMULATED_RESULTS["disks"]
+    assert 0.4 <= elapsed < 0.7  # Concurrent, not the 1.1 s the delays add up to
+
+def test_results_arrive_as_they_finish(make_runner):
+    runner = make_runner({"os": 0.3, "memory": 0.0, "bios": 0.15})
+    order = [name for name, _ in S.iter_probes(["os", "memory", "bios"], probe_with(runner), timeout=5, max_workers=3)]
+    assert order == ["memory", "bios", "os"]
+
+def test_worker_limit(make_runner):
+    runner = make_runner({name: 0.2 for name in ("os", "memory", "bios", "mac")})
+    started = time.monotonic()
+    list(S.iter_probes(["os", "memory", "bios", "mac"], probe_with(runner), timeout=5, max_workers=2))
+    assert time.monotonic() - started >= 0.4  # Two rounds of two probes
+
+def test_deadline_marks_probe_unavailable(make_runner):
+    runner = make_runner(hang=["bios"])
+    started = time.monotonic()
+    results = dict(S.iter_probes(["os", "bios", "memory"], probe_with(runner), timeout=0.3, max_workers=3))
+    assert time.monotonic() - started < 1.0
+    assert results["bios"] == S.UNAVAILABLE
+    assert results["os"] == S.SIMULATED_RESULTS["os"]
+
+def test_deadline_in_sheet(make_runner):
+    runner = make_runner(hang=["bios"])
+    data = S.get_pc_data(runner=runner, timeout=0.3, max_workers=len(S.PS_PROBES))
+    assert data["BIOS Serial"] == S.UNAVAILABLE
+    assert data["Computer Name"] == S.SIMULATED_RESULTS["hostname"]["Name"]
+
+def test_cancel_stops_collection(make_runner):
+    runner = make_runner({"memory": 0.0}, hang=["os", "bios"])
+    cancel = S.CancelToken()
+    results = {}
+    started = time.monotonic()
+    for name, result in S.iter_probes(["memory", "os", "bios", "mac", "processor"], probe_with(runner), timeout=10, cancel=cancel, max_workers=3):
+        results[name] = result
+        if name == "memory":
+            cancel.cancel()
+    assert time.monotonic() - started < 1.0
+    assert results["memory"] == S.SIMULATED_RESULTS["memory"]
+    assert all(results[name] == S.UNAVAILABLE for name in ("os", "bios", "mac", "processor"))
@@ -0,0 +1,65 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import os
+import socket
+from types import SimpleNamespace
+
+import pytest
+
+import SheetXpert as S
+
+ROOT = os.path.join(os.path.dirname(__file__), "fixtures", "linux")
+
+@pytest.fixture
+def statvfs(monkeypatch):
+    paths = []
+    def fake(path):
+        paths.append(path)
+        if not os.path.isdir(path):
+            raise OSError(2, "No such file or directory", path)
+        return SimpleNamespace(f_blocks=125000000, f_bavail=25000000, f_frsize=4096)
+    monkeypatch.setattr(S.os, "statvfs", fake)
+    return paths
+
+@pytest.fixture
+def collector():
+    return S.LinuxCollector(root=ROOT)
+
+def test_fixture_tree(collector, statvfs):
+    data = collector.collect(timeout=5)
+    assert data["Computer Name"] == "fixture-host"
+    assert data["IPv4 Address(es)"] == "192.168.1.23"
+    assert data["Operating System"] == "Ubuntu 24.04.1 LTS"
+    assert data["Total RAM (GB)"] == "15.56"
+    assert data["Disks"] == [("/", "95.37", "476.84"), ("/home", "95.37", "476.84")]
+    assert (data["Brand"], data["Model"]) == ("Dell Inc.", "Latitude 5420")
+    assert data["BIOS Serial"] == data["System Serial Number"] == "SN00000001"
+    assert data["BIOS Version"] == "1.31.0"
+    assert data["MAC"] == "AA-BB-CC-00-00-01"
+    assert data["Processor (CPU)"] == "Intel(R) Core(TM) i7-1185G7 @ 3.00GHz"
+    assert data["Screen Resolution"] == "1920 x 1080"
+    assert (data["Battery - Charge (%)"], data["Battery - Status"], data["Battery - Capacity"]) == ("87", "1", "52000")
+    assert data["Last Boot"] == S.format_date_wmi(collector._boot_time())
+    assert "Connected Network (SSID)" not in data
+
+def test_disks_are_read_under_root(collector, statvfs):
+    collector.probe_disks()
+    assert statvfs and all(path.startswith(ROOT) for path in statvfs)
+    assert os.path.join(ROOT, "media/usb drive") in statvfs  # Escaped spaces are decoded
+
+def test_identity(collector):
+    identity = collector.probe_identity()
+    assert identity == {"UUID": "4C4C4544-0042-3510-8052-B4C04F4E3332", "Name": "fixture-host",
+                        "LastBootUpTime": identity["LastBootUpTime"], "SMBIOSBIOSVersion": "1.31.0"}
+    assert len(identity["LastBootUpTime"]) == 14
+
+def test_missing_files_do_not_leak_the_real_host(tmp_path, statvfs):
+    collector = S.LinuxCollector(root=str(tmp_path))
+    assert collector.probe_hostname() == {"Name": None}
+    data = collector.collect(timeout=5)
+    assert socket.gethostname() not in data.values()
+    assert "Disks" not in data
@@ -0,0 +1,72 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import io
+import json
+import os
+
+import pytest
+
+import SheetXpert as S
+
+def write_ndjson(path, datas):
+    with open(path, "w", encoding="utf-8") as f:
+        for data in datas:
+            f.write(json.dumps(S.snapshot_to_json(data)) + "\n")
+
+def test_stdin_stays_open(monkeypatch):
+    stdin = io.StringIO(json.dumps(S.snapshot_to_json(S.sample_pc_data(1))) + "\n")
+    monkeypatch.setattr("sys.stdin", stdin)
+    assert [name for name, _, error in S.iter_snapshots(["-"]) if not error] == ["stdin_1"]
+    assert not stdin.closed
+    monkeypatch.setattr("sys.stdin", io.StringIO("pc-01\n# comment\npc-02  # spare\n"))
+    assert list(S.iter_hosts(["pc-00", "@-"])) == ["pc-00", "pc-01", "pc-02"]
+    assert not S.sys.stdin.closed
+
+def test_sheet_file_names_are_unique():
+    used = set()
+    names = [S.sheet_file_name("a_1", {"Computer Name": "PC-01"}, used),
+             S.sheet_file_name("b_1", {"Computer Name": "pc-01"}, used),
+             S.sheet_file_name("c_1", {"Computer Name": S.UNAVAILABLE}, used),
+             S.sheet_file_name("d_1", {"Computer Name": "../etc/passwd"}, used),
+             S.sheet_file_name("e_1", {"Computer Name": "PC-01_2"}, used)]
+    assert names == ["PC-01", "pc-01_2", "c_1", "etc_passwd", "PC-01_2_2"]
+
+def test_same_stem_in_two_directories(tmp_path):
+    for folder, index in (("site_a", 1), ("site_b", 2)):
+        os.makedirs(tmp_path / folder)
+        write_ndjson(tmp_path / folder / "inventory.ndjson", [S.sample_pc_data(index), S.sample_pc_data(index)])
+    out = tmp_path / "out"
+    failures = S.render_snapshots([str(tmp_path / "site_a"), str(tmp_path / "site_b")], str(out), ("txt",), "en", workers=1)
+    assert failures == []
+    assert sorted(os.listdir(out)) == ["PC-000001.txt", "PC-000001_2.txt", "PC-000002.txt", "PC-000002_2.txt"]
+
+def test_combined_and_table_from_stdin(tmp_path, monkeypatch):
+    pypdf = pytest.importorskip("pypdf")
+    pytest.importorskip("fpdf")
+    monkeypatch.setattr("sys.stdin", io.StringIO("".join(json.dumps(S.snapshot_to_json(S.sample_pc_data(i))) + "\n" for i in range(3))))
+    out = tmp_path / "out"
+    status = S.main(["render", "-", "-d", str(out), "-f", "txt", "-q", "--combined", str(tmp_path / "all.pdf"), "--table", str(tmp_path / "table.pdf")])
+    assert status == 0
+    assert len(os.listdir(out)) == 3
+    assert len(pypdf.PdfReader(str(tmp_path / "all.pdf")).pages) == 3
+    assert len(pypdf.PdfReader(str(tmp_path / "table.pdf")).pages) == 1
+
+def test_create_pdf_sheet_bypasses_the_render_cache(tmp_path):
+    pytest.importorskip("fpdf")
+    cache = S.get_render_cache()
+    cache.clear()
+    S.create_pdf_sheet(S.sample_pc_data(1), str(tmp_path / "sheet.pdf"), "en")
+    assert len(cache.entries) == 0
+    assert (tmp_path / "sheet.pdf").read_bytes().startswith(b"%PDF")
+
+def test_table_translates_unavailable():
+    pypdf = pytest.importorskip("pypdf")
+    pytest.importorskip("fpdf")
+    data = dict(S.sample_pc_data(1), **{"Total RAM (GB)": S.UNAVAILABLE})
+    text = pypdf.PdfReader(io.BytesIO(S.SheetRenderer("es").render_table([data]))).pages[0].extract_text()
+    assert S.traducciones["es"]["no_disponible"] in text
+    assert S.UNAVAILABLE not in text
@@ -0,0 +1,72 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import pytest
+
+import SheetXpert as S
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    def fake_pdf(snapshot, lang):  # Stand-in for SheetRenderer so the tests do not need fpdf
+        calls.append((snapshot["Computer Name"], lang, "pdf"))
+        return f"%PDF {snapshot['Computer Name']} {lang}".encode("ascii")
+    monkeypatch.setitem(S.RENDER_FORMATS, "pdf", fake_pdf)
+    return calls
+
+def test_digest_is_stable_and_order_independent():
+    data = S.sample_pc_data(1)
+    reordered = dict(reversed(list(data.items())))
+    assert S.Snapshot(data).digest == S.Snapshot(reordered).digest
+    assert S.Snapshot(data).digest == S.Snapshot(dict(data, Disks=[list(d) for d in data["Disks"]])).digest
+    assert S.Snapshot(data).digest != S.Snapshot(dict(data, **{"Total RAM (GB)": "32.0"})).digest
+    assert hash(S.Snapshot(data)) == hash(S.Snapshot(reordered))
+
+def test_snapshot_is_read_only_and_in_sheet_order():
+    snapshot = S.Snapshot(dict(reversed(list(S.sample_pc_data(1).items())), Unknown="x"))
+    assert list(snapshot) == [key for key in S.FIELD_ORDER if key in snapshot]
+    assert "Unknown" not in snapshot
+    with pytest.raises(TypeError):
+        snapshot["MAC"] = "x"
+
+def test_entries_per_language_and_format(renders):
+    cache = S.RenderCache()
+    data = S.Snapshot(S.sample_pc_data(1))
+    assert cache.get(data, "es", "txt") == S.format_sheet(data, "es")
+    assert cache.get(data, "en", "txt") == S.format_sheet(data, "en")
+    assert cache.get(data, "en", "pdf") == b"%PDF PC-000001 en"
+    assert cache.get(data, "es", "pdf") == b"%PDF PC-000001 es"
+    assert (cache.hits, cache.misses, len(cache.entries)) == (0, 4, 4)
+    assert cache.get(S.sample_pc_data(1), "es", "pdf") == b"%PDF PC-000001 es"  # Equal data, new dict: same entry
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert renders == [("PC-000001", "en", "pdf"), ("PC-000001", "es", "pdf")]
+
+def test_least_recently_used_is_evicted(renders):
+    cache = S.RenderCache(max_entries=2)
+    a, b, c = (S.Snapshot(S.sample_pc_data(i)) for i in range(3))
+    cache.get(a, "en", "pdf")
+    cache.get(b, "en", "pdf")
+    cache.get(a, "en", "pdf")  # a is now the most recent
+    cache.get(c, "en", "pdf")  # Evicts b
+    assert [key[0] for key in cache.entries] == [a.digest, c.digest]
+    cache.get(b, "en", "pdf")
+    assert [name for name, _, _ in renders] == ["PC-000000", "PC-000001", "PC-000002", "PC-000001"]
+
+def test_pdf_renders_are_timed(monkeypatch):
+    class FakeRenderer:
+        def render(self, data):
+            return b"%PDF fake"
+    monkeypatch.setattr(S, "get_sheet_renderer", lambda lang=None: FakeRenderer())
+    cache = S.RenderCache()
+    timings = S.enable_timings()
+    try:
+        cache.get(S.sample_pc_data(1), "en", "pdf")
+        cache.get(S.sample_pc_data(1), "en", "pdf")  # Cached: not rendered again
+        cache.get(S.sample_pc_data(1), "en", "txt")
+    finally:
+        S.disable_timings()
+    records = [(r["stage"], r["name"], r["size"]) for r in timings.records]
+    assert records == [("pdf", "render_sheet", len(b"%PDF fake")), ("format", "format_sheet", records[1][2])]
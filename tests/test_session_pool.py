@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+import SheetXpert as S
+
+FAKE_WORKER = [sys.executable, os.path.join(os.path.dirname(__file__), "fake_worker.py")]
+
+@pytest.fixture
+def pool():
+    pool = S.PowerShellPool(size=3, argv=FAKE_WORKER, timeout=10)
+    yield pool
+    pool.close()
+
+def test_frames_round_trip():
+    assert S.decode_frame(S.encode_frame(7, "run", "héllo")) == (7, "run", "héllo")
+    assert S.decode_frame("\ufeff7 ok " + S.encode_frame(0, "x", "abc").split()[2]) == (7, "ok", "abc")
+    assert S.decode_frame("WARNING: something") is None
+
+def test_run_reuses_one_worker(pool):
+    assert pool.run("echo hola") == "hola"
+    first = pool.run("pid")
+    assert pool.run("pid") == first
+    assert len(pool.sessions) == 1
+
+def test_byte_order_mark_is_ignored(pool):
+    assert pool.run("bom texto") == "texto"
+
+def test_concurrent_requests_use_separate_workers(pool):
+    pids = []
+    def call():
+        pids.append(pool.run("pid"))
+        pool.run("sleep 0.5")
+    pool.run("pid")  # Start one worker before the timing
+    started = time.monotonic()
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - started < 1.4  # Three sleeps in parallel, not one after another
+    assert len(pool.sessions) == 3
+
+def test_more_callers_than_workers_wait(pool):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.run("echo x"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["x"] * 8
+    assert len(pool.sessions) <= 3
+
+def test_timeout_kills_and_restarts_worker(pool):
+    before = pool.run("pid")
+    with pytest.raises(S.SessionTimeout):
+        pool.run("sleep 5", timeout=0.3)
+    assert pool.run("pid") != before
+
+def test_crash_is_retried_then_reported(pool):
+    before = pool.run("pid")
+    with pytest.raises(S.SessionCrashed):
+        pool.run("crash")
+    assert pool.run("echo back") == "back"
+    assert pool.run("pid") != before
+
+def test_script_error(pool):
+    with pytest.raises(S.PowerShellError, match="it failed"):
+        pool.run("error it failed")
+
+def test_ping_and_warm(pool):
+    pool.warm()
+    session = pool.sessions[0]
+    assert session.alive()
+    assert session.ping()
@@ -0,0 +1,134 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import io
+import re
+import threading
+import time
+
+import pytest
+
+import SheetXpert as S
+
+# Fake probe(name, timeout): returns the simulated result after a fixed delay and records when each probe started
+class TimedProbe:
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.started = {}
+        self.lock = threading.Lock()
+        self.origin = time.monotonic()
+
+    def __call__(self, name, timeout=None):
+        with self.lock:
+            self.started[name] = time.monotonic() - self.origin
+        time.sleep(self.delays.get(name, 0.0))
+        return S.SIMULATED_RESULTS.get(name)
+
+@pytest.fixture
+def cache(tmp_path):
+    return S.SnapshotCache(str(tmp_path / "cache.json"))
+
+def test_stale_probes_start_with_the_volatile_ones(cache):
+    probe = TimedProbe({"identity": 0.05, "disks": 0.5, "os": 0.4})
+    started = time.monotonic()
+    results = dict(S.iter_probes_cached(list(S.PS_PROBES), probe, cache, timeout=5, max_workers=len(S.PS_PROBES)))
+    assert time.monotonic() - started < 0.8  # One run of about 0.5 s, not the volatile phase followed by the stale one
+    assert probe.started["os"] < 0.3
+    assert set(results) == set(S.PS_PROBES)
+
+def test_cached_results_come_right_after_identity(cache):
+    list(S.iter_probes_cached(list(S.PS_PROBES), TimedProbe(), cache, timeout=5))
+    probe = TimedProbe({"disks": 0.5})
+    order = [name for name, _ in S.iter_probes_cached(list(S.PS_PROBES), probe, cache, timeout=5, max_workers=len(S.PS_PROBES))]
+    assert order.index("os") < order.index("disks")
+    assert "os" not in probe.started  # Static probes come from the cache
+
+def test_cached_results_keep_their_time(cache):
+    list(S.iter_probes_cached(["os", "disks"], TimedProbe(), cache, timeout=5))
+    stored = cache.entries[cache.machine_key(S.SIMULATED_RESULTS["identity"])]["probes"]["os"]["time"]
+    time.sleep(0.01)
+    list(S.iter_probes_cached(["os", "disks"], TimedProbe(), cache, timeout=5))
+    assert cache.entries[cache.machine_key(S.SIMULATED_RESULTS["identity"])]["probes"]["os"]["time"] == stored
+
+def test_identity_failure_queries_everything(cache):
+    probe = TimedProbe()
+    results = dict(S.iter_probes_cached(["os", "disks"], lambda name, timeout=None: None if name == "identity" else probe(name), cache, timeout=5))
+    assert results["os"] == S.SIMULATED_RESULTS["os"]
+    assert set(probe.started) == {"os", "disks"}
+
+def test_cancel_before_start_launches_nothing(cache):
+    cancel = S.CancelToken()
+    cancel.cancel()
+    probe = TimedProbe()
+    results = dict(S.iter_probes(["os", "bios"], probe, timeout=5, cancel=cancel))
+    assert results == {"os": S.UNAVAILABLE, "bios": S.UNAVAILABLE}
+    results = dict(S.iter_probes_cached(list(S.PS_PROBES), probe, cache, timeout=5, cancel=cancel))
+    assert set(results) == set(S.PS_PROBES)
+    assert set(results.values()) == {S.UNAVAILABLE}
+    assert probe.started == {}
+
+def test_cancel_skips_the_cached_phase(cache):
+    cancel = S.CancelToken()
+    probe = TimedProbe({"identity": 0.2})
+    results = {}
+    for name, result in S.iter_probes_cached(["os", "disks", "ipv4"], probe, cache, timeout=5, cancel=cancel, max_workers=4):
+        results[name] = result
+        cancel.cancel()
+    assert set(results) == {"identity", "os", "disks", "ipv4"}
+    assert "os" not in probe.started
+
+def test_batched_script_queries_each_class_once():
+    script = S.build_probe_script()
+    for cim_class in ("Win32_OperatingSystem", "Win32_BIOS", "Win32_ComputerSystemProduct"):
+        assert len(re.findall(rf"Get-CimInstance {cim_class}\b", script)) == 1
+    assert S.script_probe_names(script)[-1] == "identity"  # Reads the os, bios and product results
+    assert sorted(S.script_probe_names(script)) == sorted(S.PS_PROBES)
+
+def test_identity_alone_queries_its_classes():
+    script = S.build_probe_script(["identity"])
+    assert "Win32_BIOS" in script and "Win32_OperatingSystem" in script
+    assert "$r['os']" not in script
+
+# Collector whose probes answer with the simulated results after a fixed delay
+class SlowCollector(S.Collector):
+    name = "slow"
+
+    def __init__(self, delays=None):
+        self.probe = TimedProbe(delays)
+
+def test_collect_yields_cached_fields_before_slow_probes(cache):
+    SlowCollector().collect(timeout=5, cache=cache)
+    progress = []
+    started = time.monotonic()
+    arrived = {}
+    for key, _ in SlowCollector({"disks": 0.5, "identity": 0.05}).iter_collect(timeout=5, max_workers=len(S.PS_PROBES), cache=cache,
+                                                                              progress=lambda done, total: progress.append((done, total))):
+        arrived[key] = time.monotonic() - started
+    assert arrived["Computer Name"] < 0.3
+    assert arrived["Computer Name"] < arrived["Disks"]
+    assert progress[-1] == (len(S.PS_PROBES), len(S.PS_PROBES))
+
+def test_hits_and_misses_are_counted(cache):
+    timings = S.enable_timings()
+    try:
+        list(S.iter_probes_cached(["os", "bios", "mac", "disks"], TimedProbe(), cache, timeout=5))
+        assert cache.stats() == {"hits": 0, "misses": 3}  # disks is never cached, so it is not looked up
+        list(S.iter_probes_cached(["os", "bios", "mac", "disks"], TimedProbe(), cache, timeout=5))
+        assert cache.stats() == {"hits": 3, "misses": 3}
+    finally:
+        S.disable_timings()
+    assert timings.counters == {"snapshot cache hits": 3, "snapshot cache misses": 3}
+    assert timings.to_json()["counters"] == timings.counters
+    out = io.StringIO()
+    timings.print_summary(out)
+    assert "snapshot cache hits" in out.getvalue()
+    assert [r["status"] for r in timings.records if r["name"] == "os"] == ["ok", "cached"]
+
+def test_required_fields_for_the_save_dialog():
+    assert S.has_required_fields({"Computer Name": "PC-01"})
+    assert not S.has_required_fields({})
+    assert not S.has_required_fields({"Computer Name": S.UNAVAILABLE})
+    assert not S.has_required_fields({"Computer Name": ""})
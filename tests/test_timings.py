@@ -0,0 +1,90 @@
+# Copyright (c) 2025 Alexey
+# All rights reserved.
+# Strictly personal and educational use.
+# Modification, redistribution, or commercial use without express permission is prohibited.
+# See LICENSE file for more information.
+
+import io
+import json
+
+import pytest
+
+import SheetXpert as S
+
+@pytest.fixture
+def timings():
+    timings = S.enable_timings()
+    yield timings
+    S.disable_timings()
+
+def test_percentile():
+    assert S.percentile([], 50) == 0.0
+    assert S.percentile([5.0], 95) == 5.0
+    values = [float(i) for i in range(1, 101)]
+    assert S.percentile(values, 50) == 50.0
+    assert S.percentile(values, 95) == 95.0
+    assert S.percentile(values, 100) == 100.0
+
+def test_summary_rows(timings):
+    for ms in (1, 2, 3, 4, 100):
+        timings.record("probe", "os", ms / 1000, size=10)
+    timings.record("probe", "os", 0.005, "timeout")
+    timings.record("probe", "bios", 0.0, "cached", 20)
+    rows = {(row["stage"], row["name"]): row for row in timings.summary()}
+    assert rows["probe", "os"] == {"stage": "probe", "name": "os", "count": 6, "p50_ms": 3.0, "p95_ms": 100.0,
+                                   "max_ms": 100.0, "failed": 1, "mean_size": 8}
+    assert rows["probe", "bios"]["failed"] == 0  # Cached results are not failures
+    out = io.StringIO()
+    timings.print_summary(out)
+    assert out.getvalue().splitlines()[0].split() == ["stage", "name", "count", "p50", "ms", "p95", "ms", "max", "ms", "failed", "size"]
+
+def test_timed_records_status_and_size(timings):
+    with S.timed("format", "format_sheet") as info:
+        info["size"] = 42
+    with pytest.raises(RuntimeError):
+        with S.timed("pdf", "create_pdf_sheet"):
+            raise RuntimeError("boom")
+    S.record_probe("os", 0.01, "ok", {"Caption": "x"})
+    S.record_probe("bios", 0.02, "timeout", S.UNAVAILABLE)
+    records = [(r["stage"], r["name"], r["status"], r["size"]) for r in timings.records]
+    assert records == [("format", "format_sheet", "ok", 42), ("pdf", "create_pdf_sheet", "error", 0),
+                       ("probe", "os", "ok", len(json.dumps({"Caption": "x"}))), ("probe", "bios", "timeout", 0)]
+
+def test_timed_is_a_no_op_when_off():
+    S.disable_timings()
+    with S.timed("format") as info:
+        info["size"] = 1
+    S.record_probe("os", 0.01, "ok")
+
+def test_save(timings, tmp_path):
+    timings.record("collect", "powershell", 0.25)
+    timings.save(str(tmp_path / "timings.json"))
+    with open(tmp_path / "timings.json", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["records"][0]["ms"] == 250.0
+    assert saved["summary"][0]["p95_ms"] == 250.0
+
+def test_simulated_runner_answers_probe_scripts():
+    runner = S.SimulatedRunner(scale=0.01, seed=1)
+    raw = S.parse_probe_output(runner(S.build_probe_script(["os", "bios"]), timeout=5))
+    assert raw == {"os": S.SIMULATED_RESULTS["os"], "bios": S.SIMULATED_RESULTS["bios"]}
+    assert S.get_pc_data(runner=runner, timeout=5) == S.build_pc_data(S.SIMULATED_RESULTS)
+
+def test_failed_runs_are_recorded_as_errors(timings):
+    runner = S.SimulatedRunner(scale=0.01, failure_rate=1.0, seed=1)
+    assert S.get_pc_data(runner=runner, timeout=5) == {"Firewall Enabled": "Unknown"}
+    statuses = {r["status"] for r in timings.records if r["stage"] == "probe"}
+    assert statuses == {"error"}
+
+def test_benchmark_pipeline():
+    pytest.importorskip("fpdf")
+    out = io.StringIO()
+    timings = S.benchmark_pipeline(runs=2, scale=0.01, out=out)
+    rows = {(row["stage"], row["name"]): row for row in timings.summary()}
+    assert rows["pipeline", "total"]["count"] == 2
+    for stage in (("collect", "powershell"), ("format", "format_sheet"), ("pdf", "create_pdf_sheet"), ("probe", "os")):
+        assert rows[stage]["count"] == 2 and rows[stage]["failed"] == 0
+        assert 0 < rows[stage]["p50_ms"] <= rows[stage]["p95_ms"] <= rows[stage]["max_ms"]
+    text = out.getvalue()
+    assert text.startswith("2 run(s), latency scale 0.01")
+    assert "pipeline  total" in text